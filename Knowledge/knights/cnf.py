@@ -0,0 +1,243 @@
+"""
+Conversion of logical sentences to conjunctive normal form.
+
+Clauses are lists of integer literals: symbol number v stands for the
+symbol being true and -v for it being false. `variables` dictionaries
+map symbol names to these numbers and are filled in as new symbols are
+met, so several sentences can share one numbering.
+
+`to_cnf` gives an equivalent clause list but can blow up exponentially;
+`TseitinEncoder` stays linear in the size of the sentence by
+introducing auxiliary variables, and can export DIMACS files.
+"""
+
+from itertools import product
+
+from logic import And, Biconditional, Implication, Not, Or, Symbol
+
+
+def variable(variables, name):
+    """
+    Returns the number of the symbol called `name`, numbering it if new.
+    """
+    if name not in variables:
+        variables[name] = len(variables) + 1
+    return variables[name]
+
+
+def to_cnf(sentence, variables, positive=True):
+    """
+    Returns a list of clauses equivalent to `sentence`, or to its
+    negation if `positive` is False.
+
+    Negations are pushed down to the symbols and Or is distributed over
+    And, which is exact but can grow exponentially with nesting depth.
+    """
+    if isinstance(sentence, Symbol):
+        v = variable(variables, sentence.name)
+        return [[v if positive else -v]]
+
+    elif isinstance(sentence, Not):
+        return to_cnf(sentence.operand, variables, not positive)
+
+    elif isinstance(sentence, And):
+        parts = [to_cnf(conjunct, variables, positive)
+                 for conjunct in sentence.conjuncts]
+        return conjoin(parts) if positive else disjoin(parts)
+
+    elif isinstance(sentence, Or):
+        parts = [to_cnf(disjunct, variables, positive)
+                 for disjunct in sentence.disjuncts]
+        return disjoin(parts) if positive else conjoin(parts)
+
+    elif isinstance(sentence, Implication):
+        # a => b is (not a) or b; its negation is a and (not b)
+        antecedent = to_cnf(sentence.antecedent, variables, not positive)
+        consequent = to_cnf(sentence.consequent, variables, positive)
+        if positive:
+            return disjoin([antecedent, consequent])
+        return conjoin([antecedent, consequent])
+
+    elif isinstance(sentence, Biconditional):
+        left_true = to_cnf(sentence.left, variables, True)
+        left_false = to_cnf(sentence.left, variables, False)
+        right_true = to_cnf(sentence.right, variables, True)
+        right_false = to_cnf(sentence.right, variables, False)
+        if positive:
+            # (not a or b) and (a or not b)
+            return (disjoin([left_false, right_true])
+                    + disjoin([left_true, right_false]))
+        # (a or b) and (not a or not b)
+        return (disjoin([left_true, right_true])
+                + disjoin([left_false, right_false]))
+
+    raise TypeError(f"cannot convert {type(sentence).__name__} to CNF")
+
+
+def conjoin(parts):
+    """
+    Returns the conjunction of several lists of clauses.
+    """
+    return [clause for part in parts for clause in part]
+
+
+def disjoin(parts):
+    """
+    Returns clauses for the disjunction of several lists of clauses,
+    leaving out tautological clauses.
+    """
+    clauses = []
+    for combination in product(*parts):
+        literals = set()
+        for clause in combination:
+            literals.update(clause)
+        if not any(-literal in literals for literal in literals):
+            clauses.append(sorted(literals, key=abs))
+    return clauses
+
+
+class TseitinEncoder():
+    """
+    Compiles sentences to clauses with the Tseitin transformation.
+
+    Every compound subsentence gets a fresh variable constrained to be
+    equivalent to it, so the clauses grow linearly with the size of the
+    sentence. The result is equisatisfiable with the sentence rather than
+    equivalent. Symbol numbers, gate variables and clauses persist across
+    calls, and structurally equal gates over the same literals share one
+    variable, so an encoder can be fed many sentences incrementally.
+    """
+
+    def __init__(self):
+        # Symbol names to variable numbers, as for `to_cnf`
+        self.variables = {}
+        self.num_vars = 0
+        self.clauses = []
+        # Gate keys such as ("and", (1, -2)) to their variable
+        self.gates = {}
+        self.true = None
+
+    def new_var(self):
+        self.num_vars += 1
+        return self.num_vars
+
+    def symbol(self, name):
+        """
+        Returns the variable of the symbol called `name`, numbering it if new.
+        """
+        if name not in self.variables:
+            self.variables[name] = self.new_var()
+        return self.variables[name]
+
+    def constant(self, value):
+        """
+        Returns a literal that is always `value`.
+        """
+        if self.true is None:
+            self.true = self.new_var()
+            self.clauses.append([self.true])
+        return self.true if value else -self.true
+
+    def encode(self, sentence):
+        """
+        Returns a literal equivalent to `sentence` under the clauses.
+        """
+        if isinstance(sentence, Symbol):
+            return self.symbol(sentence.name)
+
+        elif isinstance(sentence, Not):
+            return -self.encode(sentence.operand)
+
+        elif isinstance(sentence, And):
+            return self.conjunction(
+                [self.encode(conjunct) for conjunct in sentence.conjuncts]
+            )
+
+        elif isinstance(sentence, Or):
+            return -self.conjunction(
+                [-self.encode(disjunct) for disjunct in sentence.disjuncts]
+            )
+
+        elif isinstance(sentence, Implication):
+            # a => b is not (a and not b)
+            return -self.conjunction([self.encode(sentence.antecedent),
+                                      -self.encode(sentence.consequent)])
+
+        elif isinstance(sentence, Biconditional):
+            return self.equivalence(self.encode(sentence.left),
+                                    self.encode(sentence.right))
+
+        raise TypeError(f"cannot encode {type(sentence).__name__}")
+
+    def conjunction(self, literals):
+        """
+        Returns a literal equivalent to the conjunction of `literals`.
+        """
+        literals = sorted(set(literals), key=abs)
+        if any(-literal in literals for literal in literals):
+            return self.constant(False)
+        if not literals:
+            return self.constant(True)
+        if len(literals) == 1:
+            return literals[0]
+
+        key = ("and", tuple(literals))
+        if key not in self.gates:
+            gate = self.new_var()
+            self.gates[key] = gate
+            # gate => each literal, and all literals => gate
+            for literal in literals:
+                self.clauses.append([-gate, literal])
+            self.clauses.append([gate] + [-literal for literal in literals])
+        return self.gates[key]
+
+    def equivalence(self, left, right):
+        """
+        Returns a literal equivalent to `left` <=> `right`.
+        """
+        if left == right:
+            return self.constant(True)
+        if left == -right:
+            return self.constant(False)
+        left, right = sorted((left, right))
+
+        key = ("iff", left, right)
+        if key not in self.gates:
+            gate = self.new_var()
+            self.gates[key] = gate
+            self.clauses.append([-gate, -left, right])
+            self.clauses.append([-gate, left, -right])
+            self.clauses.append([gate, left, right])
+            self.clauses.append([gate, -left, -right])
+        return self.gates[key]
+
+    def add(self, sentence):
+        """
+        Adds clauses asserting that `sentence` is true.
+        Top-level conjunctions and disjunctions need no gate variable.
+        """
+        if isinstance(sentence, And):
+            for conjunct in sentence.conjuncts:
+                self.add(conjunct)
+        elif isinstance(sentence, Or):
+            self.clauses.append(
+                [self.encode(disjunct) for disjunct in sentence.disjuncts]
+            )
+        else:
+            self.clauses.append([self.encode(sentence)])
+
+    def dimacs(self):
+        """
+        Returns the clauses in DIMACS CNF format, with comment lines
+        giving the variable number of each symbol.
+        """
+        lines = [f"c {number} {name}"
+                 for name, number in self.variables.items()]
+        lines.append(f"p cnf {self.num_vars} {len(self.clauses)}")
+        for clause in self.clauses:
+            lines.append(" ".join(str(literal) for literal in clause + [0]))
+        return "\n".join(lines) + "\n"
+
+    def write_dimacs(self, path):
+        with open(path, "w") as f:
+            f.write(self.dimacs())
@@ -0,0 +1,116 @@
+"""
+Compilation of logical sentences to Python functions over bitmasks.
+
+A model over symbols s0, s1, ... is packed into an integer whose bit i
+is the truth value of symbol si. Compiling a sentence generates the
+source of a Python function evaluating it on that integer, mostly as
+one expression, so evaluating it needs no method calls, no dict lookups
+and evaluates each subsentence once.
+"""
+
+from functools import lru_cache
+
+from logic import And, Biconditional, Implication, Not, Or, Symbol
+
+
+# Deeper subexpressions are hoisted into temporaries, keeping the
+# generated source well inside the parser's nesting limits
+MAX_DEPTH = 50
+
+
+def expression(sentence, index, statements):
+    """
+    Returns Python source evaluating `sentence` on a bitmask `m`, where
+    `index` maps each symbol name to its bit. Subexpressions nested more
+    than MAX_DEPTH deep are assigned to temporaries by lines appended to
+    `statements`, which must run before the expression.
+    """
+    source, _ = nested(sentence, index, statements)
+    return source
+
+
+def nested(sentence, index, statements):
+    """
+    Returns (source, depth) for `expression`, where depth is the nesting
+    depth of the source returned.
+    """
+    if isinstance(sentence, Symbol):
+        try:
+            return f"(m & {1 << index[sentence.name]} != 0)", 1
+        except KeyError:
+            raise Exception(f"variable {sentence.name} not in model")
+
+    elif isinstance(sentence, Not):
+        operand, depth = nested(sentence.operand, index, statements)
+        source = f"(not {operand})"
+
+    elif isinstance(sentence, (And, Or)):
+        parts = [nested(child, index, statements)
+                 for child in sentence.children()]
+        if not parts:
+            return ("True" if isinstance(sentence, And) else "False"), 0
+        joiner = " and " if isinstance(sentence, And) else " or "
+        source = "(" + joiner.join(part for part, _ in parts) + ")"
+        depth = max(depth for _, depth in parts)
+
+    elif isinstance(sentence, Implication):
+        antecedent, left = nested(sentence.antecedent, index, statements)
+        consequent, right = nested(sentence.consequent, index, statements)
+        source = f"(not {antecedent} or {consequent})"
+        depth = max(left, right)
+
+    elif isinstance(sentence, Biconditional):
+        left, left_depth = nested(sentence.left, index, statements)
+        right, right_depth = nested(sentence.right, index, statements)
+        source = f"({left} == {right})"
+        depth = max(left_depth, right_depth)
+
+    else:
+        raise TypeError(f"cannot compile {type(sentence).__name__}")
+
+    if depth + 1 < MAX_DEPTH:
+        return source, depth + 1
+    name = f"t{len(statements)}"
+    statements.append(f"    {name} = {source}")
+    return name, 0
+
+
+def compile_sentence(sentence, symbols):
+    """
+    Returns a function from a bitmask to the truth value of `sentence`,
+    where bit i of the mask holds the value of the symbol named symbols[i].
+    """
+    index = {name: i for i, name in enumerate(symbols)}
+    statements = ["def evaluate(m):"]
+    source = expression(sentence, index, statements)
+    statements.append(f"    return {source}")
+    return function("\n".join(statements))
+
+
+@lru_cache(maxsize=256)
+def function(source):
+    """
+    Returns the function defined by `source`, reusing earlier compilations
+    so a knowledge base queried repeatedly is only compiled once.
+    """
+    namespace = {}
+    exec(source, namespace)
+    return namespace["evaluate"]
+
+
+def model_mask(model, symbols):
+    """
+    Returns the bitmask of a model dictionary.
+    """
+    return sum(1 << i for i, name in enumerate(symbols) if model[name])
+
+
+def compiled_model_check(knowledge, query):
+    """Checks if knowledge base entails query, enumerating every model
+    as an integer and evaluating compiled sentences on it."""
+    symbols = sorted(set.union(knowledge.symbols(), query.symbols()))
+    knowledge = compile_sentence(knowledge, symbols)
+    query = compile_sentence(query, symbols)
+
+    # Query must hold in every model where the knowledge holds
+    return all(map(query, filter(knowledge, range(1 << len(symbols)))))
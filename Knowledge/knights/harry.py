@@ -1,4 +1,5 @@
 from logic import *
+from knowledge_base import KnowledgeBase
 
 people = ["Gilderoy", "Pomona", "Minerva", "Horace"]
 houses = ["Gryffondor", "Poufssoufle", "Serpentard", "Serdaigle"]
@@ -45,7 +46,9 @@ knowledge.add(Not(Symbol("PomonaSerpentard")))
 knowledge.add((Symbol("MinervaGryffondor")))
 
 
+# One solver answers every query, reusing what it learns
+kb = KnowledgeBase(knowledge)
 for symbol in symbols:
-  if model_check(knowledge,symbol):
+  if kb.entails(symbol):
     print(symbol)
 
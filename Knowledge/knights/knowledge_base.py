@@ -0,0 +1,54 @@
+"""
+Incremental knowledge base answering many entailment queries.
+
+The knowledge is compiled once into a persistent SAT solver. Each query
+adds only the clauses defining its own literal and is answered by
+solving under the assumption that the query is false, so clauses the
+solver learns while answering one query speed up the next.
+"""
+
+from cnf import TseitinEncoder
+from logic import And
+from sat import Solver
+
+
+class KnowledgeBase():
+
+    def __init__(self, *sentences):
+        self.encoder = TseitinEncoder()
+        self.solver = Solver()
+        # Number of encoder clauses already given to the solver
+        self.added = 0
+        self.sentences = And()
+        for sentence in sentences:
+            self.add(sentence)
+
+    def add(self, sentence):
+        """
+        Adds a sentence to the knowledge base.
+        """
+        self.sentences.add(sentence)
+        self.encoder.add(sentence)
+        self.flush()
+
+    def flush(self):
+        """
+        Gives the solver every clause encoded since the last flush.
+        """
+        for clause in self.encoder.clauses[self.added:]:
+            self.solver.add_clause(clause)
+        self.added = len(self.encoder.clauses)
+
+    def entails(self, query):
+        """
+        Returns True if the knowledge base entails query.
+        """
+        literal = self.encoder.encode(query)
+        self.flush()
+        return not self.solver.solve([-literal])
+
+    def consistent(self):
+        """
+        Returns True if the knowledge base has at least one model.
+        """
+        return self.solver.solve()
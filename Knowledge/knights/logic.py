@@ -1,8 +1,16 @@
 import itertools
 
+# Canonical sentences by class and children, for `intern`
+_interned = {}
+
 
 class Sentence():
 
+    # Fields are slots. A sentence is frozen if no And (the only mutable
+    # sentence) appears in it; it may cache its hash and symbol set when
+    # its children are all frozen, as an And only changes through add
+    __slots__ = ("_hash", "_symbols", "_frozen", "_cacheable")
+
     def evaluate(self, model):
         """Evaluates the logical sentence."""
         raise Exception("nothing to evaluate")
@@ -13,7 +21,52 @@ class Sentence():
 
     def symbols(self):
         """Returns a set of all symbols in the logical sentence."""
-        return set()
+        return set(self.symbol_set())
+
+    def children(self):
+        """Returns the immediate subsentences."""
+        return ()
+
+    def symbol_set(self):
+        """Returns the set of all symbols in the sentence, which may be
+        cached and must not be modified."""
+        symbols = self._symbols
+        if symbols is None:
+            symbols = frozenset().union(
+                *[child.symbol_set() for child in self.children()]
+            )
+            if self._cacheable:
+                self._symbols = symbols
+        return symbols
+
+    def structural_hash(self):
+        """Returns the hash of the sentence, computed from its children."""
+        return hash(type(self).__name__)
+
+    def cached_hash(self):
+        """Returns the hash of the sentence, caching it if possible."""
+        value = self._hash
+        if value is None:
+            value = self.structural_hash()
+            if self._cacheable:
+                self._hash = value
+        return value
+
+    def init_cache(self):
+        """Sets up empty caches; called once the fields are set."""
+        self._hash = None
+        self._symbols = None
+        self._frozen = all(child._frozen for child in self.children())
+        self._cacheable = self._frozen
+
+    def __getstate__(self):
+        # Leave the caches out; they are rebuilt on demand
+        return {name: getattr(self, name) for name in type(self).__slots__}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.init_cache()
 
     @classmethod
     def validate(cls, sentence):
@@ -44,8 +97,11 @@ class Sentence():
 
 class Symbol(Sentence):
 
+    __slots__ = ("name",)
+
     def __init__(self, name):
         self.name = name
+        self.init_cache()
 
     def __eq__(self, other):
         return isinstance(other, Symbol) and self.name == other.name
@@ -65,19 +121,30 @@ class Symbol(Sentence):
     def formula(self):
         return self.name
 
-    def symbols(self):
-        return {self.name}
+    def symbol_set(self):
+        if self._symbols is None:
+            self._symbols = frozenset([self.name])
+        return self._symbols
 
 
 class Not(Sentence):
+
+    __slots__ = ("operand",)
+
     def __init__(self, operand):
         Sentence.validate(operand)
         self.operand = operand
+        self.init_cache()
 
     def __eq__(self, other):
-        return isinstance(other, Not) and self.operand == other.operand
+        return self is other or (
+            isinstance(other, Not) and self.operand == other.operand
+        )
 
     def __hash__(self):
+        return self.cached_hash()
+
+    def structural_hash(self):
         return hash(("not", hash(self.operand)))
 
     def __repr__(self):
@@ -89,23 +156,34 @@ class Not(Sentence):
     def formula(self):
         return "¬" + Sentence.parenthesize(self.operand.formula())
 
-    def symbols(self):
-        return self.operand.symbols()
+    def children(self):
+        return (self.operand,)
 
 
 class And(Sentence):
+
+    __slots__ = ("conjuncts",)
+
     def __init__(self, *conjuncts):
         for conjunct in conjuncts:
             Sentence.validate(conjunct)
         self.conjuncts = list(conjuncts)
+        self.init_cache()
 
     def __eq__(self, other):
-        return isinstance(other, And) and self.conjuncts == other.conjuncts
+        return self is other or (
+            isinstance(other, And) and self.conjuncts == other.conjuncts
+        )
 
     def __hash__(self):
-        return hash(
-            ("and", tuple(hash(conjunct) for conjunct in self.conjuncts))
-        )
+        return self.cached_hash()
+
+    def structural_hash(self):
+        # Folded one conjunct at a time, so add can extend a cached hash
+        value = hash("and")
+        for conjunct in self.conjuncts:
+            value = hash((value, hash(conjunct)))
+        return value
 
     def __repr__(self):
         conjunctions = ", ".join(
@@ -116,6 +194,29 @@ class And(Sentence):
     def add(self, conjunct):
         Sentence.validate(conjunct)
         self.conjuncts.append(conjunct)
+        self._cacheable = self._cacheable and conjunct._frozen
+        if not self._cacheable:
+            self._hash = None
+            self._symbols = None
+            return
+        if self._hash is not None:
+            self._hash = hash((self._hash, hash(conjunct)))
+        if self._symbols is not None:
+            self._symbols |= conjunct.symbol_set()
+
+    def init_cache(self):
+        Sentence.init_cache(self)
+        # An And can change, so sentences containing one cannot cache,
+        # but it keeps its own caches up to date in add
+        self._frozen = False
+
+    def symbol_set(self):
+        if self._symbols is None and self._cacheable:
+            # A mutable set, so add can extend it in place
+            self._symbols = set().union(
+                *[conjunct.symbol_set() for conjunct in self.conjuncts]
+            )
+        return Sentence.symbol_set(self)
 
     def evaluate(self, model):
         return all(conjunct.evaluate(model) for conjunct in self.conjuncts)
@@ -126,20 +227,29 @@ class And(Sentence):
         return " ∧ ".join([Sentence.parenthesize(conjunct.formula())
                            for conjunct in self.conjuncts])
 
-    def symbols(self):
-        return set.union(*[conjunct.symbols() for conjunct in self.conjuncts])
+    def children(self):
+        return self.conjuncts
 
 
 class Or(Sentence):
+
+    __slots__ = ("disjuncts",)
+
     def __init__(self, *disjuncts):
         for disjunct in disjuncts:
             Sentence.validate(disjunct)
         self.disjuncts = list(disjuncts)
+        self.init_cache()
 
     def __eq__(self, other):
-        return isinstance(other, Or) and self.disjuncts == other.disjuncts
+        return self is other or (
+            isinstance(other, Or) and self.disjuncts == other.disjuncts
+        )
 
     def __hash__(self):
+        return self.cached_hash()
+
+    def structural_hash(self):
         return hash(
             ("or", tuple(hash(disjunct) for disjunct in self.disjuncts))
         )
@@ -157,23 +267,30 @@ class Or(Sentence):
         return " ∨  ".join([Sentence.parenthesize(disjunct.formula())
                             for disjunct in self.disjuncts])
 
-    def symbols(self):
-        return set.union(*[disjunct.symbols() for disjunct in self.disjuncts])
+    def children(self):
+        return self.disjuncts
 
 
 class Implication(Sentence):
+
+    __slots__ = ("antecedent", "consequent")
+
     def __init__(self, antecedent, consequent):
         Sentence.validate(antecedent)
         Sentence.validate(consequent)
         self.antecedent = antecedent
         self.consequent = consequent
+        self.init_cache()
 
     def __eq__(self, other):
-        return (isinstance(other, Implication)
-                and self.antecedent == other.antecedent
-                and self.consequent == other.consequent)
+        return self is other or (isinstance(other, Implication)
+                                 and self.antecedent == other.antecedent
+                                 and self.consequent == other.consequent)
 
     def __hash__(self):
+        return self.cached_hash()
+
+    def structural_hash(self):
         return hash(("implies", hash(self.antecedent), hash(self.consequent)))
 
     def __repr__(self):
@@ -188,23 +305,30 @@ class Implication(Sentence):
         consequent = Sentence.parenthesize(self.consequent.formula())
         return f"{antecedent} => {consequent}"
 
-    def symbols(self):
-        return set.union(self.antecedent.symbols(), self.consequent.symbols())
+    def children(self):
+        return (self.antecedent, self.consequent)
 
 
 class Biconditional(Sentence):
+
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right):
         Sentence.validate(left)
         Sentence.validate(right)
         self.left = left
         self.right = right
+        self.init_cache()
 
     def __eq__(self, other):
-        return (isinstance(other, Biconditional)
-                and self.left == other.left
-                and self.right == other.right)
+        return self is other or (isinstance(other, Biconditional)
+                                 and self.left == other.left
+                                 and self.right == other.right)
 
     def __hash__(self):
+        return self.cached_hash()
+
+    def structural_hash(self):
         return hash(("biconditional", hash(self.left), hash(self.right)))
 
     def __repr__(self):
@@ -221,8 +345,32 @@ class Biconditional(Sentence):
         right = Sentence.parenthesize(str(self.right))
         return f"{left} <=> {right}"
 
-    def symbols(self):
-        return set.union(self.left.symbols(), self.right.symbols())
+    def children(self):
+        return (self.left, self.right)
+
+
+def intern(sentence):
+    """Returns a canonical sentence equal to the given one, in which
+    structurally equal subsentences are one shared object. Interned
+    sentences may be shared widely, so they should not be mutated."""
+    if isinstance(sentence, Symbol):
+        key = (Symbol, sentence.name)
+        if key not in _interned:
+            _interned[key] = sentence
+        return _interned[key]
+
+    children = [intern(child) for child in sentence.children()]
+    # Children are canonical and kept alive by the table, so their
+    # identities can stand in for their structure
+    key = (type(sentence), tuple(id(child) for child in children))
+    if key not in _interned:
+        _interned[key] = type(sentence)(*children)
+    return _interned[key]
+
+
+def clear_interned():
+    """Forgets every interned sentence."""
+    _interned.clear()
 
 
 def model_check(knowledge, query):
@@ -0,0 +1,86 @@
+"""
+Model checking spread across a process pool.
+
+The symbols are sorted and the first few are fixed in every possible
+way, giving one subtree of models per assignment. Each worker enumerates
+the models of its subtree exactly as `model_check` would, and as soon as
+one finds a model of the knowledge base where the query is false, the
+others are told to stop and the pending subtrees are cancelled.
+"""
+
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from logic import model_check
+
+# Below this many symbols a pool costs more than it saves
+MIN_SYMBOLS = 14
+
+# How many models a worker checks between looks at the stop flag
+CHECK_INTERVAL = 1024
+
+# Set in each worker by `init_worker`
+knowledge = None
+query = None
+stop = None
+
+
+def init_worker(worker_knowledge, worker_query, worker_stop):
+    global knowledge, query, stop
+    knowledge = worker_knowledge
+    query = worker_query
+    stop = worker_stop
+
+
+def check_subtree(fixed, remaining):
+    """
+    Returns False if some model extending the `fixed` assignment over the
+    `remaining` symbols satisfies the knowledge base but not the query,
+    True otherwise or once another worker has found such a model.
+    """
+    for count, values in enumerate(
+        itertools.product((True, False), repeat=len(remaining))
+    ):
+        if count % CHECK_INTERVAL == 0 and stop.is_set():
+            return True
+        model = dict(fixed)
+        model.update(zip(remaining, values))
+        if knowledge.evaluate(model) and not query.evaluate(model):
+            return False
+    return True
+
+
+def parallel_model_check(knowledge, query, workers=None, split=None):
+    """Checks if knowledge base entails query, checking the subtrees of
+    models for each assignment to the first `split` symbols in parallel."""
+    symbols = sorted(set.union(knowledge.symbols(), query.symbols()))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(symbols) < MIN_SYMBOLS:
+        return model_check(knowledge, query)
+
+    if split is None:
+        # A few subtrees per worker, so an early counter-model is found
+        # early and uneven subtrees balance out
+        split = (4 * workers - 1).bit_length()
+    split = min(split, len(symbols))
+    fixed_symbols, remaining = symbols[:split], symbols[split:]
+
+    flag = multiprocessing.Event()
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                               initargs=(knowledge, query, flag))
+    try:
+        pending = {
+            pool.submit(check_subtree, list(zip(fixed_symbols, values)),
+                        remaining)
+            for values in itertools.product((True, False), repeat=split)
+        }
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            if not all(future.result() for future in done):
+                flag.set()
+                return False
+        return True
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,290 @@
+"""
+CDCL SAT solver and SAT-based entailment.
+
+The solver uses two watched literals per clause for unit propagation,
+learns first-UIP conflict clauses with non-chronological backjumping,
+and picks branching variables by VSIDS-style activity. Clauses can be
+added between calls, and `solve` accepts assumption literals, so one
+solver can answer many related questions.
+"""
+
+from cnf import TseitinEncoder
+
+
+class Solver():
+
+    def __init__(self):
+        self.num_vars = 0
+        self.clauses = []
+        # Maps a literal to the indices of clauses watching it
+        self.watches = {}
+        # Per variable (index 0 unused): value, decision level,
+        # index of the clause that implied it, and branching activity
+        self.assigns = [None]
+        self.level = [0]
+        self.reason = [None]
+        self.activity = [0.0]
+        self.phase = [False]
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+        self.var_inc = 1.0
+        self.var_decay = 0.95
+        # False once the clauses are unsatisfiable without assumptions
+        self.ok = True
+        self.model = None
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+
+    def new_var(self):
+        """
+        Returns the number of a fresh variable.
+        """
+        self.num_vars += 1
+        self.assigns.append(None)
+        self.level.append(0)
+        self.reason.append(None)
+        self.activity.append(0.0)
+        self.phase.append(False)
+        self.watches[self.num_vars] = []
+        self.watches[-self.num_vars] = []
+        return self.num_vars
+
+    def value(self, literal):
+        """
+        Returns True, False or None (unassigned) for a literal.
+        """
+        value = self.assigns[abs(literal)]
+        if value is None:
+            return None
+        return value if literal > 0 else not value
+
+    def decision_level(self):
+        return len(self.trail_lim)
+
+    def add_clause(self, literals):
+        """
+        Adds a clause, given as an iterable of non-zero integer literals.
+        Returns False if the clauses became unsatisfiable.
+        """
+        if not self.ok:
+            return False
+        self.cancel_until(0)
+
+        clause = []
+        for literal in dict.fromkeys(literals):
+            while abs(literal) > self.num_vars:
+                self.new_var()
+            value = self.value(literal)
+            if value is True or -literal in clause:
+                # Satisfied at the top level, or a tautology
+                return True
+            if value is None:
+                clause.append(literal)
+
+        if not clause:
+            self.ok = False
+        elif len(clause) == 1:
+            self.enqueue(clause[0], None)
+            self.ok = self.propagate() is None
+        else:
+            self.attach(clause)
+        return self.ok
+
+    def attach(self, clause):
+        """
+        Stores a clause watching its first two literals; returns its index.
+        """
+        index = len(self.clauses)
+        self.clauses.append(clause)
+        self.watches[clause[0]].append(index)
+        self.watches[clause[1]].append(index)
+        return index
+
+    def enqueue(self, literal, reason):
+        var = abs(literal)
+        self.assigns[var] = literal > 0
+        self.level[var] = self.decision_level()
+        self.reason[var] = reason
+        self.trail.append(literal)
+
+    def propagate(self):
+        """
+        Propagates unit clauses; returns a conflicting clause index or None.
+        """
+        while self.qhead < len(self.trail):
+            false_literal = -self.trail[self.qhead]
+            self.qhead += 1
+            self.propagations += 1
+            watching = self.watches[false_literal]
+            kept = []
+            conflict = None
+            for position, index in enumerate(watching):
+                clause = self.clauses[index]
+                # Keep the false literal second
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+                if self.value(clause[0]) is True:
+                    kept.append(index)
+                    continue
+
+                # Look for another literal to watch
+                for k in range(2, len(clause)):
+                    if self.value(clause[k]) is not False:
+                        clause[1], clause[k] = clause[k], clause[1]
+                        self.watches[clause[1]].append(index)
+                        break
+                else:
+                    kept.append(index)
+                    if self.value(clause[0]) is False:
+                        conflict = index
+                        kept.extend(watching[position + 1:])
+                        break
+                    self.enqueue(clause[0], index)
+            self.watches[false_literal] = kept
+            if conflict is not None:
+                self.qhead = len(self.trail)
+                return conflict
+        return None
+
+    def analyze(self, conflict):
+        """
+        Returns (learnt clause, backjump level) for a conflict, learning
+        the first unique implication point clause.
+        """
+        learnt = [None]
+        seen = set()
+        counter = 0
+        literal = None
+        index = len(self.trail) - 1
+        clause = self.clauses[conflict]
+        while True:
+            for q in clause:
+                var = abs(q)
+                if q == literal or var in seen or self.level[var] == 0:
+                    continue
+                seen.add(var)
+                self.bump(var)
+                if self.level[var] == self.decision_level():
+                    counter += 1
+                else:
+                    learnt.append(q)
+
+            # Walk back along the trail to the next literal to resolve on
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            literal = self.trail[index]
+            index -= 1
+            counter -= 1
+            if counter == 0:
+                break
+            clause = self.clauses[self.reason[abs(literal)]]
+
+        learnt[0] = -literal
+        if len(learnt) == 1:
+            return learnt, 0
+        # Watch the literal from the highest remaining level second
+        highest = max(range(1, len(learnt)),
+                      key=lambda i: self.level[abs(learnt[i])])
+        learnt[1], learnt[highest] = learnt[highest], learnt[1]
+        return learnt, self.level[abs(learnt[1])]
+
+    def bump(self, var):
+        self.activity[var] += self.var_inc
+        if self.activity[var] > 1e100:
+            for v in range(1, self.num_vars + 1):
+                self.activity[v] *= 1e-100
+            self.var_inc *= 1e-100
+
+    def cancel_until(self, level):
+        """
+        Undoes every assignment above decision level `level`.
+        """
+        if self.decision_level() <= level:
+            return
+        start = self.trail_lim[level]
+        for literal in self.trail[start:]:
+            var = abs(literal)
+            self.phase[var] = literal > 0
+            self.assigns[var] = None
+            self.reason[var] = None
+        del self.trail[start:]
+        del self.trail_lim[level:]
+        self.qhead = len(self.trail)
+
+    def pick_branch_variable(self):
+        """
+        Returns the unassigned variable with the highest activity, or None.
+        """
+        best = None
+        for var in range(1, self.num_vars + 1):
+            if self.assigns[var] is None and (
+                best is None or self.activity[var] > self.activity[best]
+            ):
+                best = var
+        return best
+
+    def solve(self, assumptions=()):
+        """
+        Returns True if the clauses are satisfiable with every assumption
+        literal true, storing a satisfying assignment in `model`.
+        """
+        self.model = None
+        if not self.ok:
+            return False
+        self.cancel_until(0)
+        for literal in assumptions:
+            while abs(literal) > self.num_vars:
+                self.new_var()
+
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                if self.decision_level() == 0:
+                    self.ok = False
+                    return False
+                learnt, level = self.analyze(conflict)
+                self.cancel_until(level)
+                if len(learnt) == 1:
+                    self.enqueue(learnt[0], None)
+                else:
+                    self.enqueue(learnt[0], self.attach(learnt))
+                self.var_inc /= self.var_decay
+                continue
+
+            # Assumptions are decided first, one per decision level
+            if self.decision_level() < len(assumptions):
+                literal = assumptions[self.decision_level()]
+                value = self.value(literal)
+                if value is False:
+                    self.cancel_until(0)
+                    return False
+                self.trail_lim.append(len(self.trail))
+                if value is None:
+                    self.enqueue(literal, None)
+                continue
+
+            var = self.pick_branch_variable()
+            if var is None:
+                self.model = {v: self.assigns[v]
+                              for v in range(1, self.num_vars + 1)}
+                self.cancel_until(0)
+                return True
+            self.decisions += 1
+            self.trail_lim.append(len(self.trail))
+            self.enqueue(var if self.phase[var] else -var, None)
+
+
+def sat_check(knowledge, query):
+    """Checks if knowledge base entails query, by showing that
+    knowledge and not query is unsatisfiable."""
+    encoder = TseitinEncoder()
+    encoder.add(knowledge)
+    query_literal = encoder.encode(query)
+    solver = Solver()
+    for clause in encoder.clauses:
+        if not solver.add_clause(clause):
+            return True
+    return not solver.solve([-query_literal])
@@ -0,0 +1,252 @@
+"""
+Simplification of knowledge bases before entailment checking.
+
+`simplify` flattens nested And and Or, folds constants, propagates facts
+known from unit conjuncts (a symbol or its negation) through the other
+conjuncts, and drops clauses subsumed by shorter ones. The result is
+equivalent to the original sentence. Truth and falsity are written as
+And() and Or(), which every engine here evaluates as True and False.
+"""
+
+from logic import And, Biconditional, Implication, Not, Or, Symbol, model_check
+
+
+def size(sentence):
+    """
+    Returns the number of nodes in a sentence tree.
+    """
+    return 1 + sum(size(child) for child in sentence.children())
+
+
+def literal(sentence):
+    """
+    Returns (name, value) if sentence is a symbol or a negated symbol,
+    or None.
+    """
+    if isinstance(sentence, Symbol):
+        return sentence.name, True
+    if isinstance(sentence, Not) and isinstance(sentence.operand, Symbol):
+        return sentence.operand.name, False
+    return None
+
+
+def negate(sentence):
+    """
+    Returns the negation of a sentence, removing a double negation.
+    """
+    if isinstance(sentence, Not):
+        return sentence.operand
+    return Not(sentence)
+
+
+def reduce(sentence, known):
+    """
+    Returns `sentence` simplified under `known`, a dictionary of symbol
+    names to truth values, as a Sentence or as True or False.
+    """
+    if isinstance(sentence, Symbol):
+        return known.get(sentence.name, sentence)
+
+    elif isinstance(sentence, Not):
+        operand = reduce(sentence.operand, known)
+        if isinstance(operand, bool):
+            return not operand
+        return negate(operand)
+
+    elif isinstance(sentence, And):
+        return combine(And, [reduce(conjunct, known)
+                             for conjunct in sentence.conjuncts])
+
+    elif isinstance(sentence, Or):
+        return combine(Or, [reduce(disjunct, known)
+                            for disjunct in sentence.disjuncts])
+
+    elif isinstance(sentence, Implication):
+        antecedent = reduce(sentence.antecedent, known)
+        consequent = reduce(sentence.consequent, known)
+        if antecedent is False or consequent is True:
+            return True
+        if antecedent is True:
+            return consequent
+        if consequent is False:
+            return negate(antecedent)
+        if antecedent == consequent:
+            return True
+        return Implication(antecedent, consequent)
+
+    elif isinstance(sentence, Biconditional):
+        left = reduce(sentence.left, known)
+        right = reduce(sentence.right, known)
+        if isinstance(left, bool) and isinstance(right, bool):
+            return left == right
+        if isinstance(left, bool):
+            left, right = right, left
+        if isinstance(right, bool):
+            return left if right else negate(left)
+        if left == right:
+            return True
+        if left == negate(right):
+            return False
+        return Biconditional(left, right)
+
+    raise TypeError(f"cannot simplify {type(sentence).__name__}")
+
+
+def combine(operator, parts):
+    """
+    Returns the And or Or of simplified parts, flattening nested uses of
+    the same operator and folding constants and duplicates.
+    """
+    # False decides an And and True an Or; the opposite value is dropped
+    absorbing = operator is Or
+    items = []
+    for part in parts:
+        if isinstance(part, operator):
+            part = (part.conjuncts if operator is And else part.disjuncts)
+        else:
+            part = [part]
+        for item in part:
+            if item is absorbing:
+                return absorbing
+            if item is not (not absorbing) and item not in items:
+                items.append(item)
+
+    for item in items:
+        if negate(item) in items:
+            return absorbing
+    if not items:
+        return not absorbing
+    if len(items) == 1:
+        return items[0]
+    return operator(*items)
+
+
+def propagate(conjuncts):
+    """
+    Returns (known, rest): the facts fixed by unit conjuncts, propagated
+    until nothing changes, and the remaining conjuncts simplified under
+    them. Returns (None, None) if the conjuncts are contradictory.
+    """
+    known = {}
+    while True:
+        rest = []
+        for conjunct in conjuncts:
+            conjunct = reduce(conjunct, known)
+            if conjunct is False:
+                return None, None
+            if conjunct is True:
+                continue
+            parts = (conjunct.conjuncts if isinstance(conjunct, And)
+                     else [conjunct])
+            rest.extend(parts)
+
+        units = [literal(part) for part in rest]
+        if not any(units):
+            return known, rest
+        for unit in units:
+            if unit is not None:
+                name, value = unit
+                if known.get(name, value) != value:
+                    return None, None
+                known[name] = value
+        conjuncts = [part for part, unit in zip(rest, units) if unit is None]
+
+
+def clause(sentence):
+    """
+    Returns the literals of a disjunction of literals as a frozenset,
+    or None for any other sentence.
+    """
+    parts = sentence.disjuncts if isinstance(sentence, Or) else [sentence]
+    literals = [literal(part) for part in parts]
+    if not all(literals):
+        return None
+    return frozenset(literals)
+
+
+def remove_subsumed(conjuncts):
+    """
+    Returns the conjuncts without clauses implied by a smaller clause.
+    """
+    clauses = [clause(conjunct) for conjunct in conjuncts]
+    kept = []
+    for i, conjunct in enumerate(conjuncts):
+        literals = clauses[i]
+        if literals is not None and any(
+            other is not None and other < literals
+            or other == literals and j < i
+            for j, other in enumerate(clauses) if j != i
+        ):
+            continue
+        kept.append(conjunct)
+    return kept
+
+
+def facts(known):
+    """
+    Returns the known facts as a list of symbols and negated symbols.
+    """
+    return [Symbol(name) if value else Not(Symbol(name))
+            for name, value in sorted(known.items())]
+
+
+def split(knowledge):
+    """
+    Returns (known, rest) for a knowledge base: the facts it fixes and a
+    simplified sentence over the other symbols, such that the knowledge
+    base is equivalent to the facts and `rest` together. Returns
+    (None, Or()) if the knowledge base is contradictory.
+    """
+    known, rest = propagate([knowledge])
+    if known is None:
+        return None, Or()
+    rest = remove_subsumed(rest)
+    if len(rest) == 1:
+        return known, rest[0]
+    return known, And(*rest)
+
+
+def simplify(knowledge):
+    """
+    Returns a simplified sentence equivalent to the knowledge base.
+    """
+    known, rest = split(knowledge)
+    if known is None:
+        return Or()
+    conjuncts = facts(known)
+    if not (isinstance(rest, And) and not rest.conjuncts):
+        conjuncts.append(rest)
+    if len(conjuncts) == 1:
+        return conjuncts[0]
+    return And(*conjuncts)
+
+
+def statistics(before, after):
+    """
+    Returns node and symbol counts of a sentence before and after
+    simplification.
+    """
+    return {
+        "nodes_before": size(before),
+        "nodes_after": size(after),
+        "symbols_before": len(before.symbols()),
+        "symbols_after": len(after.symbols()),
+    }
+
+
+def simplified_check(knowledge, query, check=model_check):
+    """Checks if knowledge base entails query, by simplifying both and
+    giving the smaller problem to `check`.
+
+    The facts fixed by the knowledge base are substituted into the query,
+    so `check` only sees the symbols they leave undetermined."""
+    known, rest = split(knowledge)
+    if known is None:
+        return True
+    query = reduce(query, known)
+    if query is True:
+        return True
+    if query is False:
+        # Entailed only if no model of the rest exists
+        return check(rest, Or())
+    return check(rest, query)
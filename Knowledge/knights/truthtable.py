@@ -0,0 +1,124 @@
+"""
+Bit-parallel truth tables for logical sentences.
+
+Instead of evaluating a sentence on one model at a time, the models are
+processed in blocks of 2^block_bits. Within a block every symbol's truth
+values form one column, packed into a Python integer with one bit per
+model, and a sentence is evaluated on the whole block at once with
+bitwise operations: And is &, Or is |, Not is xor with all ones.
+"""
+
+from logic import And, Biconditional, Implication, Not, Or, Symbol
+
+BLOCK_BITS = 16
+
+
+def column_patterns(bits):
+    """
+    Returns the columns of the first `bits` symbols over a block of
+    2^bits models, where bit j of column i is bit i of j.
+    """
+    width = 1 << bits
+    patterns = []
+    for i in range(bits):
+        period = 1 << i
+        # Half a period of zeros, then half a period of ones, repeated
+        pattern = ((1 << period) - 1) << period
+        size = 2 * period
+        while size < width:
+            pattern |= pattern << size
+            size *= 2
+        patterns.append(pattern)
+    return patterns
+
+
+def evaluate_block(sentence, columns, full):
+    """
+    Returns the truth values of `sentence` on a block of models, given a
+    dictionary of symbol names to columns and the all-ones column `full`.
+    """
+    if isinstance(sentence, Symbol):
+        try:
+            return columns[sentence.name]
+        except KeyError:
+            raise Exception(f"variable {sentence.name} not in model")
+
+    elif isinstance(sentence, Not):
+        return full ^ evaluate_block(sentence.operand, columns, full)
+
+    elif isinstance(sentence, And):
+        value = full
+        for conjunct in sentence.conjuncts:
+            value &= evaluate_block(conjunct, columns, full)
+            if not value:
+                break
+        return value
+
+    elif isinstance(sentence, Or):
+        value = 0
+        for disjunct in sentence.disjuncts:
+            value |= evaluate_block(disjunct, columns, full)
+            if value == full:
+                break
+        return value
+
+    elif isinstance(sentence, Implication):
+        antecedent = evaluate_block(sentence.antecedent, columns, full)
+        consequent = evaluate_block(sentence.consequent, columns, full)
+        return (full ^ antecedent) | consequent
+
+    elif isinstance(sentence, Biconditional):
+        left = evaluate_block(sentence.left, columns, full)
+        right = evaluate_block(sentence.right, columns, full)
+        return full ^ (left ^ right)
+
+    raise TypeError(f"cannot evaluate {type(sentence).__name__}")
+
+
+def blocks(symbols, block_bits=BLOCK_BITS):
+    """
+    Yields (columns, full) for successive blocks covering every model
+    of `symbols`, as used by `evaluate_block`.
+    """
+    symbols = list(symbols)
+    bits = min(len(symbols), block_bits)
+    full = (1 << (1 << bits)) - 1
+    inner = dict(zip(symbols, column_patterns(bits)))
+    outer = symbols[bits:]
+    # Symbols past the first `bits` are constant within a block
+    for block in range(1 << len(outer)):
+        columns = dict(inner)
+        for i, name in enumerate(outer):
+            columns[name] = full if block >> i & 1 else 0
+        yield columns, full
+
+
+def count_models(sentence, symbols=None, block_bits=BLOCK_BITS):
+    """
+    Returns the number of models of `symbols` (by default the sentence's
+    own symbols) in which `sentence` is true.
+    """
+    if symbols is None:
+        symbols = sorted(sentence.symbols())
+    return sum(bin(evaluate_block(sentence, columns, full)).count("1")
+               for columns, full in blocks(symbols, block_bits))
+
+
+def truth_table_check(knowledge, query, block_bits=BLOCK_BITS):
+    """
+    Returns (entailed, count): whether knowledge base entails query, and
+    the number of models over both sentences' symbols in which the
+    knowledge base is true.
+    """
+    symbols = sorted(set.union(knowledge.symbols(), query.symbols()))
+    entailed = True
+    count = 0
+    for columns, full in blocks(symbols, block_bits):
+        models = evaluate_block(knowledge, columns, full)
+        if not models:
+            continue
+        count += bin(models).count("1")
+        # Any model of the knowledge where the query is false
+        if entailed and models & ~evaluate_block(query, columns, full):
+            entailed = False
+    return entailed, count
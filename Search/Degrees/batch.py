@@ -0,0 +1,166 @@
+"""
+Batch degrees of separation queries.
+
+Reads tab-separated (source, target) pairs of names or IMDB ids, one pair
+per line, and writes one JSON object per pair. Queries are grouped by
+source so that a single breadth first search answers every target of
+that source, and sources can be spread across a process pool.
+
+Usage: python batch.py directory pairs.tsv [--output results.jsonl]
+                       [--workers N] [--compact [--no-cache]]
+"""
+
+import argparse
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import degrees
+
+
+def read_pairs(f):
+    """
+    Yields (source, target) pairs from tab-separated lines,
+    skipping blank lines and `#` comments.
+    """
+    for line in f:
+        line = line.rstrip("\n")
+        if not line.strip() or line.startswith("#"):
+            continue
+        fields = line.split("\t")
+        if len(fields) != 2:
+            raise ValueError(f"expected two tab-separated fields: {line!r}")
+        yield fields[0].strip(), fields[1].strip()
+
+
+def resolve(value):
+    """
+    Returns the person id for an IMDB id or an unambiguous name,
+    or raises LookupError.
+    """
+    try:
+        degrees.person_for_id(value)
+        return value
+    except KeyError:
+        pass
+    if degrees.graph is not None:
+        person_ids = degrees.graph.person_ids_for_name(value)
+    else:
+        person_ids = list(degrees.names.get(value.lower(), ()))
+    if not person_ids:
+        raise LookupError(f"person not found: {value!r}")
+    if len(person_ids) > 1:
+        raise LookupError(f"ambiguous name {value!r}: {sorted(person_ids)}")
+    return person_ids[0]
+
+
+def group_queries(pairs):
+    """
+    Resolves pairs and groups them by source id.
+
+    Returns (groups, errors) where `groups` maps a source id to a list of
+    (source, target, target id) queries and `errors` is a list of results
+    for pairs that could not be resolved.
+    """
+    groups = {}
+    errors = []
+    for source, target in pairs:
+        try:
+            source_id = resolve(source)
+            target_id = resolve(target)
+        except LookupError as e:
+            errors.append({"source": source, "target": target,
+                           "error": str(e)})
+            continue
+        groups.setdefault(source_id, []).append((source, target, target_id))
+    return groups, errors
+
+
+def answer(source_id, queries):
+    """
+    Answers every query of one source with a single search tree.
+    """
+    paths = degrees.shortest_paths_from(
+        source_id, [target_id for _, _, target_id in queries]
+    )
+    results = []
+    for source, target, target_id in queries:
+        path = paths[target_id]
+        results.append({
+            "source": source,
+            "target": target,
+            "source_id": source_id,
+            "target_id": target_id,
+            "degrees": None if path is None else len(path),
+            "path": path,
+        })
+    return results
+
+
+def init_worker(directory, backend, cache):
+    """
+    Loads the dataset in a pool worker, unless it was inherited on fork.
+    """
+    if not degrees.people and degrees.graph is None:
+        degrees.load_data(directory, backend, cache)
+
+
+def run(groups, output, workers=1, directory=None, backend="dict",
+        cache=True):
+    """
+    Answers grouped queries, writing results to `output` as JSON lines
+    as soon as each source is done.
+    """
+    def write(results):
+        for result in results:
+            output.write(json.dumps(result) + "\n")
+        output.flush()
+
+    if workers <= 1:
+        for source_id, queries in groups.items():
+            write(answer(source_id, queries))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(directory, backend, cache)) as pool:
+        futures = [pool.submit(answer, source_id, queries)
+                   for source_id, queries in groups.items()]
+        for future in as_completed(futures):
+            write(future.result())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("directory")
+    parser.add_argument("pairs", help="tab-separated pairs file, or - for stdin")
+    parser.add_argument("--output", help="JSON lines output file (default stdout)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of processes answering sources")
+    parser.add_argument("--compact", action="store_true",
+                        help="use the integer-indexed CSR graph backend")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="neither read nor write the binary snapshot")
+    args = parser.parse_args()
+
+    backend = "compact" if args.compact else "dict"
+    cache = not args.no_cache
+    degrees.load_data(args.directory, backend, cache)
+
+    if args.pairs == "-":
+        groups, errors = group_queries(read_pairs(sys.stdin))
+    else:
+        with open(args.pairs, encoding="utf-8") as f:
+            groups, errors = group_queries(read_pairs(f))
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        for error in errors:
+            output.write(json.dumps(error) + "\n")
+        run(groups, output, args.workers, args.directory, backend, cache)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
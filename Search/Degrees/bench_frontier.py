@@ -0,0 +1,70 @@
+"""
+Micro-benchmark of the list-based and deque-based frontiers.
+
+Usage: python bench_frontier.py [--sizes 1000 10000 ...] [--max-legacy N]
+"""
+
+import argparse
+import time
+
+from util import (Node, StackFrontier, QueueFrontier,
+                  IndexedStackFrontier, IndexedQueueFrontier)
+
+FRONTIERS = [
+    ("StackFrontier", StackFrontier, True),
+    ("QueueFrontier", QueueFrontier, True),
+    ("IndexedStackFrontier", IndexedStackFrontier, False),
+    ("IndexedQueueFrontier", IndexedQueueFrontier, False),
+]
+
+# Number of contains_state calls made per run
+PROBES = 1000
+
+
+def run(frontier_class, size):
+    """
+    Adds `size` nodes, probes membership, then drains the frontier.
+    Returns (add, contains, remove) timings in seconds.
+    """
+    frontier = frontier_class()
+    nodes = [Node(movie=None, state=i, parent=None) for i in range(size)]
+
+    start = time.perf_counter()
+    for node in nodes:
+        frontier.add(node)
+    added = time.perf_counter()
+
+    step = max(1, (2 * size) // PROBES)
+    for state in range(0, 2 * size, step):
+        frontier.contains_state(state)
+    probed = time.perf_counter()
+
+    while not frontier.empty():
+        frontier.remove()
+    removed = time.perf_counter()
+
+    return added - start, probed - added, removed - probed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6])
+    parser.add_argument("--max-legacy", type=int, default=10 ** 5,
+                        help="largest size run for the quadratic list frontiers")
+    args = parser.parse_args()
+
+    print(f"{'frontier':<22}{'nodes':>10}{'add':>10}{'contains':>10}"
+          f"{'remove':>10}")
+    for size in args.sizes:
+        for name, frontier_class, legacy in FRONTIERS:
+            if legacy and size > args.max_legacy:
+                print(f"{name:<22}{size:>10}{'skipped':>30}")
+                continue
+            add, contains, remove = run(frontier_class, size)
+            print(f"{name:<22}{size:>10}{add:>10.4f}{contains:>10.4f}"
+                  f"{remove:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
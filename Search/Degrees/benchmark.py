@@ -0,0 +1,183 @@
+"""
+Benchmark suite for degrees on synthetic scale-free datasets.
+
+Generates people/movies/stars CSV files with power-law cast sizes and
+actor popularity, then for each dataset size and loader configuration
+starts a fresh process that loads the data and runs the same random
+queries with each search variant. Emits a JSON report of load time,
+peak memory and p50/p99 query latency.
+
+Usage: python benchmark.py [--edges 1000 100000 ...] [--queries N]
+                           [--configs dict compact ...] [--output report.json]
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+CONFIGS = ["dict", "streaming", "compact", "compact+costars"]
+VARIANTS = ["bfs-list", "bfs", "bidirectional"]
+
+# People per star edge, and the largest cast, in generated datasets
+PEOPLE_PER_EDGE = 0.25
+MAX_CAST = 200
+
+
+def generate(directory, edges, seed=0):
+    """
+    Writes a synthetic dataset with about `edges` star rows to `directory`.
+
+    Cast sizes follow a Pareto distribution and actors are drawn with a
+    skew towards low ids, so a few people star in many movies.
+    """
+    generator = random.Random(seed)
+    people = max(2, int(edges * PEOPLE_PER_EDGE))
+    os.makedirs(directory, exist_ok=True)
+
+    with open(os.path.join(directory, "people.csv"), "w", newline="",
+              encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "birth"])
+        for person in range(people):
+            writer.writerow([person + 1, f"Person {person + 1}",
+                             1900 + generator.randrange(110)])
+
+    movies = 0
+    with open(os.path.join(directory, "stars.csv"), "w", newline="",
+              encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["person_id", "movie_id"])
+        written = 0
+        while written < edges:
+            cast = min(MAX_CAST, int(generator.paretovariate(1.5)) + 1,
+                       edges - written)
+            movies += 1
+            for _ in range(cast):
+                person = int(people * generator.random() ** 3)
+                writer.writerow([person + 1, movies])
+            written += cast
+
+    with open(os.path.join(directory, "movies.csv"), "w", newline="",
+              encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "title", "year"])
+        for movie in range(1, movies + 1):
+            writer.writerow([movie, f"Movie {movie}",
+                             1900 + generator.randrange(120)])
+    return people, movies
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def run_config(directory, config, variants, queries, seed):
+    """
+    Loads `directory` with one configuration and times every variant.
+    Runs inside a worker process so globals and peak memory are isolated.
+    """
+    import degrees
+    import util
+
+    backend, _, extra = config.partition("+")
+    start = time.perf_counter()
+    degrees.load_data(directory, backend, cache=False,
+                      costars=extra == "costars")
+    load_time = time.perf_counter() - start
+    report = {"config": config, "load_seconds": load_time,
+              "peak_rss_bytes": degrees.peak_rss(), "variants": {}}
+
+    if degrees.graph is not None:
+        person_ids = degrees.graph.person_ids
+    else:
+        person_ids = list(degrees.people)
+    generator = random.Random(seed)
+    pairs = [(generator.choice(person_ids), generator.choice(person_ids))
+             for _ in range(queries)]
+
+    for variant in variants:
+        latencies = []
+        for source, target in pairs:
+            start = time.perf_counter()
+            if variant == "bfs-list":
+                degrees.shortest_path(source, target,
+                                      frontier_class=util.QueueFrontier)
+            else:
+                degrees.shortest_path(source, target,
+                                      variant == "bidirectional")
+            latencies.append(time.perf_counter() - start)
+        report["variants"][variant] = {
+            "queries": len(latencies),
+            "p50_ms": percentile(latencies, 0.5) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            "total_seconds": sum(latencies),
+        }
+    report["peak_rss_bytes"] = degrees.peak_rss()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--edges", type=int, nargs="+",
+                        default=[10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--configs", nargs="+", default=CONFIGS,
+                        choices=CONFIGS)
+    parser.add_argument("--variants", nargs="+", default=VARIANTS,
+                        choices=VARIANTS)
+    parser.add_argument("--max-legacy-edges", type=int, default=10 ** 4,
+                        help="largest dataset the bfs-list variant runs on")
+    parser.add_argument("--workdir", help="where to keep generated datasets")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="report file (default stdout)")
+    parser.add_argument("--worker", nargs=2, metavar=("DIRECTORY", "CONFIG"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        directory, config = args.worker
+        json.dump(run_config(directory, config, args.variants, args.queries,
+                             args.seed), sys.stdout)
+        return
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="degrees-bench-")
+    report = {"queries": args.queries, "seed": args.seed, "datasets": []}
+    for edges in args.edges:
+        directory = os.path.join(workdir, f"edges-{edges}")
+        start = time.perf_counter()
+        people, movies = generate(directory, edges, args.seed)
+        dataset = {"edges": edges, "people": people, "movies": movies,
+                   "generate_seconds": time.perf_counter() - start,
+                   "runs": []}
+        variants = [variant for variant in args.variants
+                    if variant != "bfs-list" or edges <= args.max_legacy_edges]
+        for config in args.configs:
+            print(f"{edges} edges, {config}...", file=sys.stderr)
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__),
+                 "--worker", directory, config,
+                 "--queries", str(args.queries), "--seed", str(args.seed),
+                 "--variants", *variants],
+                check=True, capture_output=True, text=True,
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+            ).stdout
+            dataset["runs"].append(json.loads(output))
+        report["datasets"].append(dataset)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Person -> co-star adjacency, with one representative movie per edge,
+so that a search expands people directly instead of going through
+every movie and every star of every movie on each step.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class CostarIndex():
+    """
+    Co-star lists derived from a `neighbors(person_id)` function yielding
+    (movie_id, person_id) pairs.
+
+    With `max_size` None, the lists of all `person_ids` are built up front.
+    Otherwise they are built on demand and at most `max_size` of them are
+    kept, least recently used first out.
+    """
+
+    def __init__(self, neighbors, person_ids=(), max_size=None):
+        self.source = neighbors
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.lists = OrderedDict()
+        if max_size is None:
+            for person_id in person_ids:
+                self.lists[person_id] = self.build(person_id)
+
+    def build(self, person_id):
+        """
+        Returns a tuple of (movie_id, person_id) pairs with one entry per
+        co-star, keeping the smallest movie id shared with each.
+        """
+        costars = {}
+        for movie_id, costar in self.source(person_id):
+            if costar == person_id:
+                continue
+            if costar not in costars or movie_id < costars[costar]:
+                costars[costar] = movie_id
+        return tuple((movie_id, costar) for costar, movie_id in costars.items())
+
+    def neighbors_for_person(self, person_id):
+        """
+        Returns (movie_id, person_id) pairs for the co-stars of a person.
+        """
+        if self.max_size is None:
+            return self.lists[person_id]
+
+        with self.lock:
+            costars = self.lists.get(person_id)
+            if costars is not None:
+                self.hits += 1
+                self.lists.move_to_end(person_id)
+                return costars
+            self.misses += 1
+
+        costars = self.build(person_id)
+        with self.lock:
+            self.lists[person_id] = costars
+            while len(self.lists) > self.max_size:
+                self.lists.popitem(last=False)
+        return costars
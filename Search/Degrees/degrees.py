@@ -1,7 +1,12 @@
+import argparse
 import csv
 import sys
+import time
 
-from util import Node, StackFrontier, QueueFrontier
+from costars import CostarIndex
+from loader import load_streaming, peak_rss
+from snapshot import load_graph
+from util import Node, IndexedQueueFrontier
 
 # Maps names to a set of corresponding person_ids
 names = {}
@@ -12,10 +17,56 @@ people = {}
 # Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
 movies = {}
 
+# Integer-indexed CSR graph, used instead of the dictionaries above
+# when data is loaded with the "compact" backend
+graph = None
 
-def load_data(directory):
+# Precomputed co-star lists, used by neighbors_for_person when loaded
+costar_index = None
+
+
+def load_data(directory, backend="dict", cache=True, costars=False,
+              costar_cache=None):
     """
     Load data from CSV files into memory.
+
+    The "dict" backend fills the `names`, `people` and `movies` dictionaries;
+    the "compact" backend builds an integer-indexed `CompactGraph` instead,
+    reusing the binary snapshot next to the CSV files when `cache` is set.
+    The "streaming" backend fills the same dictionaries in chunks, with
+    interned ids and slotted records, for datasets too big for "dict".
+
+    With `costars` set, a person -> co-star index is also built, for every
+    person up front or, given a `costar_cache` size, lazily in an LRU cache.
+    On the compact backend it is keyed by person index, like the graph.
+
+    Returns True if the data came from a snapshot.
+    """
+    global graph, costar_index
+
+    if backend == "compact":
+        graph, cached = load_graph(directory, cache)
+    elif backend == "dict":
+        load_csv(directory)
+        cached = False
+    elif backend == "streaming":
+        load_streaming(directory, names, people, movies)
+        cached = False
+    else:
+        raise ValueError(f"unknown backend {backend!r}")
+
+    if costars and graph is not None:
+        costar_index = CostarIndex(graph.neighbors, range(len(graph.person_ids)),
+                                   costar_cache)
+    elif costars:
+        costar_index = CostarIndex(movie_neighbors_for_person, list(people),
+                                   costar_cache)
+    return cached
+
+
+def load_csv(directory):
+    """
+    Load the CSV files into the `names`, `people` and `movies` dictionaries.
     """
     # Load people
     with open(f"{directory}/people.csv", encoding="utf-8") as f:
@@ -53,14 +104,44 @@ def load_data(directory):
 
 
 def main():
-    if len(sys.argv) > 2:
-        sys.exit("Usage: python degrees.py [directory]")
-    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+    parser = argparse.ArgumentParser(
+        usage="python degrees.py [directory] [--compact [--no-cache] | --streaming]\n"
+              "       [--bidirectional] [--costars [--costar-cache N]]"
+    )
+    parser.add_argument("directory", nargs="?", default="large")
+    parser.add_argument("--compact", action="store_true",
+                        help="use the integer-indexed CSR graph backend")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="neither read nor write the binary snapshot")
+    parser.add_argument("--streaming", action="store_true",
+                        help="use the chunked low-memory CSV loader")
+    parser.add_argument("--bidirectional", action="store_true",
+                        help="search from both people at once")
+    parser.add_argument("--costars", action="store_true",
+                        help="precompute each person's co-stars at load time")
+    parser.add_argument("--costar-cache", type=int, metavar="N",
+                        help="build co-star lists lazily, keeping at most N")
+    args = parser.parse_args()
 
     # Load data from files into memory
     print("Loading data...")
-    load_data(directory)
-    print("Data loaded.")
+    start = time.perf_counter()
+    if args.compact:
+        backend = "compact"
+    elif args.streaming:
+        backend = "streaming"
+    else:
+        backend = "dict"
+    cached = load_data(args.directory, backend,
+                       cache=not args.no_cache,
+                       costars=args.costars or args.costar_cache is not None,
+                       costar_cache=args.costar_cache)
+    elapsed = time.perf_counter() - start
+    print(f"Data loaded in {elapsed:.3f}s "
+          f"({'warm, from snapshot' if cached else 'cold, from CSV'}).")
+    peak = peak_rss()
+    if peak is not None:
+        print(f"Peak RSS: {peak / 2 ** 20:.1f} MiB.")
 
     source = person_id_for_name(input("Name: "))
     if source is None:
@@ -69,7 +150,7 @@ def main():
     if target is None:
         sys.exit("Person not found.")
 
-    path = shortest_path(source, target)
+    path = shortest_path(source, target, args.bidirectional)
 
     if path is None:
         print("Not connected.")
@@ -78,30 +159,84 @@ def main():
         print(f"{degrees} degrees of separation.")
         path = [(None, source)] + path
         for i in range(degrees):
-            person1 = people[path[i][1]]["name"]
-            person2 = people[path[i + 1][1]]["name"]
-            movie = movies[path[i + 1][0]]["title"]
+            person1 = person_for_id(path[i][1])["name"]
+            person2 = person_for_id(path[i + 1][1])["name"]
+            movie = movie_for_id(path[i + 1][0])["title"]
             print(f"{i + 1}: {person1} and {person2} starred in {movie}")
 
 
-def shortest_path(source, target):
+def shortest_path(source, target, bidirectional=False,
+                  frontier_class=IndexedQueueFrontier):
     """
     Returns the shortest list of (movie_id, person_id) pairs
     that connect the source to the target.
 
     If no possible path, returns None.
+
+    `frontier_class` selects the queue used by the one-sided search,
+    e.g. `util.QueueFrontier` for the original list-based frontier.
+
+    With the compact backend the search runs on integer graph indices,
+    and ids are only translated for the endpoints and the final path.
+    """
+    if graph is not None:
+        return graph_shortest_path(source, target, bidirectional,
+                                   frontier_class)
+    if bidirectional:
+        return bidirectional_shortest_path(source, target)
+    return breadth_first_search(source, target, neighbors_for_person,
+                                frontier_class)
+
+
+def graph_shortest_path(source, target, bidirectional=False,
+                        frontier_class=IndexedQueueFrontier):
+    """
+    Returns the shortest path between two person ids as `shortest_path`
+    does, searching the compact `graph` by index.
+    """
+    source = graph.person_index[source]
+    target = graph.person_index[target]
+    if bidirectional:
+        path = bidirectional_shortest_path(
+            source, target, graph_neighbors(), graph_neighbors()
+        )
+    else:
+        path = breadth_first_search(source, target, graph_neighbors(),
+                                    frontier_class)
+    if path is None:
+        return None
+    return [(graph.movie_ids[movie], graph.person_ids[person])
+            for movie, person in path]
+
+
+def graph_neighbors():
+    """
+    Returns a function giving the (movie index, person index) pairs
+    reachable from a person index, for use by a single search of the
+    compact `graph`: the co-star index if there is one, else the graph.
+    """
+    if costar_index is not None:
+        return costar_index.neighbors_for_person
+    return graph.search_neighbors()
+
+
+def breadth_first_search(source, target, neighbors, frontier_class):
+    """
+    Returns the shortest list of (movie, person) pairs connecting the
+    source to the target, with `neighbors(person)` giving the pairs
+    reachable from a person, or None if there is no path.
     """
     # We use breadth First search
     list_path = []
-    visited = []
+    visited = set()
     # Initialize frontier to just the starting position
     start = Node(movie=None,state=source,parent=None)
-    queue = QueueFrontier()
+    queue = frontier_class()
     queue.add(start)
     
     while True:
         if queue.empty():
-            raise Exception("no solution")
+            return None
 
         node = queue.remove()
         # If state is the target then we have a Solution
@@ -113,28 +248,180 @@ def shortest_path(source, target):
             list_path.reverse()
             return list_path
         # Mark node as explored
-        visited.append(node.state) 
-        
-        neighbors = list(neighbors_for_person(node.state))
+        visited.add(node.state) 
         
-        for movie,state in neighbors:
+        for movie,state in neighbors(node.state):
             if not queue.contains_state(state) and state not in visited:
                 child = Node(movie=movie,state=state,parent=node)
                 queue.add(child)
 
 
+def shortest_paths_from(source, targets):
+    """
+    Returns a dictionary mapping each of `targets` to the shortest list
+    of (movie_id, person_id) pairs connecting `source` to it, or to None
+    if it is not connected, using a single breadth first search tree.
+
+    With the compact backend the tree is grown over graph indices.
+    """
+    if graph is not None:
+        return graph_shortest_paths_from(source, targets)
+    return search_tree_paths(source, targets, neighbors_for_person)
+
+
+def graph_shortest_paths_from(source, targets):
+    """
+    Returns the shortest paths from a person id to each of `targets` as
+    `shortest_paths_from` does, searching the compact `graph` by index.
+    """
+    person_index = graph.person_index
+    paths = search_tree_paths(person_index[source],
+                              [person_index[target] for target in targets],
+                              graph_neighbors())
+    return {
+        graph.person_ids[target]: None if path is None else [
+            (graph.movie_ids[movie], graph.person_ids[person])
+            for movie, person in path
+        ]
+        for target, path in paths.items()
+    }
+
+
+def search_tree_paths(source, targets, neighbors):
+    """
+    Returns a dictionary mapping each of `targets` to the shortest list of
+    (movie, person) pairs connecting `source` to it, or to None, with
+    `neighbors(person)` giving the pairs reachable from a person.
+    """
+    remaining = set(targets)
+    parents = {source: None}
+    frontier = [source]
+    paths = {}
+
+    while True:
+        for person in frontier:
+            if person in remaining:
+                paths[person] = _join_paths(parents, {person: None}, person)
+                remaining.discard(person)
+        if not remaining or not frontier:
+            break
+
+        next_frontier = []
+        for person in frontier:
+            for movie, neighbor in neighbors(person):
+                if neighbor not in parents:
+                    parents[neighbor] = (movie, person)
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+
+    for person in remaining:
+        paths[person] = None
+    return paths
+
+
+def bidirectional_shortest_path(source, target, forward_neighbors=None,
+                                backward_neighbors=None):
+    """
+    Breadth first search from both the source and the target, one level
+    at a time, always expanding the smaller frontier.
+
+    Returns the same (movie_id, person_id) path format as `shortest_path`.
+    The neighbor functions default to `neighbors_for_person`; the compact
+    backend passes functions over graph indices instead.
+    """
+    forward_neighbors = forward_neighbors or neighbors_for_person
+    backward_neighbors = backward_neighbors or neighbors_for_person
+    if source == target:
+        return []
+
+    # Maps each reached person to the (movie_id, person_id) edge leading
+    # back towards the source (forward) or on towards the target (backward)
+    forward = {source: None}
+    backward = {target: None}
+    forward_frontier = [source]
+    backward_frontier = [target]
+
+    while forward_frontier and backward_frontier:
+        expand_forward = len(forward_frontier) <= len(backward_frontier)
+        if expand_forward:
+            frontier, reached, other = forward_frontier, forward, backward
+            neighbors = forward_neighbors
+        else:
+            frontier, reached, other = backward_frontier, backward, forward
+            neighbors = backward_neighbors
+
+        # Expand the whole level so the best meeting point is kept
+        next_frontier = []
+        meeting = None
+        for person_id in frontier:
+            for movie_id, neighbor in neighbors(person_id):
+                if neighbor in reached:
+                    continue
+                reached[neighbor] = (movie_id, person_id)
+                next_frontier.append(neighbor)
+                if neighbor in other:
+                    length = _depth(forward, neighbor) + _depth(backward, neighbor)
+                    if meeting is None or length < meeting[0]:
+                        meeting = (length, neighbor)
+
+        if meeting is not None:
+            return _join_paths(forward, backward, meeting[1])
+
+        if expand_forward:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+
+    return None
+
+
+def _depth(parents, person_id):
+    """
+    Returns the number of edges from `person_id` to the root of `parents`.
+    """
+    depth = 0
+    while parents[person_id] is not None:
+        person_id = parents[person_id][1]
+        depth += 1
+    return depth
+
+
+def _join_paths(forward, backward, meeting):
+    """
+    Joins the forward and backward search trees at the meeting person
+    into a list of (movie_id, person_id) pairs.
+    """
+    path = []
+    person_id = meeting
+    while forward[person_id] is not None:
+        movie_id, parent = forward[person_id]
+        path.append((movie_id, person_id))
+        person_id = parent
+    path.reverse()
+
+    person_id = meeting
+    while backward[person_id] is not None:
+        movie_id, child = backward[person_id]
+        path.append((movie_id, child))
+        person_id = child
+    return path
+
+
 def person_id_for_name(name):
     """
     Returns the IMDB id for a person's name,
     resolving ambiguities as needed.
     """
-    person_ids = list(names.get(name.lower(), set()))
+    if graph is not None:
+        person_ids = graph.person_ids_for_name(name)
+    else:
+        person_ids = list(names.get(name.lower(), set()))
     if len(person_ids) == 0:
         return None
     elif len(person_ids) > 1:
         print(f"Which '{name}'?")
         for person_id in person_ids:
-            person = people[person_id]
+            person = person_for_id(person_id)
             name = person["name"]
             birth = person["birth"]
             print(f"ID: {person_id}, Name: {name}, Birth: {birth}")
@@ -154,6 +441,24 @@ def neighbors_for_person(person_id):
     Returns (movie_id, person_id) pairs for people
     who starred with a given person.
     """
+    if costar_index is None:
+        return movie_neighbors_for_person(person_id)
+    if graph is None:
+        return costar_index.neighbors_for_person(person_id)
+
+    costars = costar_index.neighbors_for_person(graph.person_index[person_id])
+    return {(graph.movie_ids[movie], graph.person_ids[person])
+            for movie, person in costars}
+
+
+def movie_neighbors_for_person(person_id):
+    """
+    Returns (movie_id, person_id) pairs for people who starred with
+    a given person, by walking the person's movies.
+    """
+    if graph is not None:
+        return graph.neighbors_for_person(person_id)
+
     movie_ids = people[person_id]["movies"]
     neighbors = set()
     for movie_id in movie_ids:
@@ -162,4 +467,26 @@ def neighbors_for_person(person_id):
     return neighbors
 
 
+def person_for_id(person_id):
+    """
+    Returns the record (with at least "name" and "birth") for a person id.
+    """
+    if graph is not None:
+        return graph.person(person_id)
+    return people[person_id]
+
+
+def movie_for_id(movie_id):
+    """
+    Returns the record (with at least "title" and "year") for a movie id.
+    """
+    if graph is not None:
+        return graph.movie(movie_id)
+    return movies[movie_id]
+
+
+
+
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+import csv
+from array import array
+
+
+class CompactGraph():
+    """
+    Integer-indexed people/movies graph.
+
+    IMDB ids are interned to dense integers and the person -> movie and
+    movie -> person relations are stored in CSR form: an `offsets` array
+    of length n + 1 and an `indices` array, so that the movies of person
+    `i` are `person_movies[person_offsets[i]:person_offsets[i + 1]]`.
+    """
+
+    def __init__(self):
+        # Index -> IMDB id, and IMDB id -> index
+        self.person_ids = []
+        self.person_index = {}
+        self.movie_ids = []
+        self.movie_index = {}
+
+        # Per-index record fields
+        self.person_names = []
+        self.person_births = []
+        self.movie_titles = []
+        self.movie_years = []
+
+        # Maps lowercase names to a list of person indices
+        self.names = {}
+
+        # CSR adjacency
+        self.person_offsets = array("q", [0])
+        self.person_movies = array("q")
+        self.movie_offsets = array("q", [0])
+        self.movie_stars = array("q")
+
+    @classmethod
+    def from_csv(cls, directory):
+        """
+        Builds a graph from the people, movies and stars CSV files.
+        """
+        graph = cls()
+
+        with open(f"{directory}/people.csv", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for person_id, name, birth in reader:
+                graph.person_index[person_id] = len(graph.person_ids)
+                graph.person_ids.append(person_id)
+                graph.person_names.append(name)
+                graph.person_births.append(birth)
+
+        with open(f"{directory}/movies.csv", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for movie_id, title, year in reader:
+                graph.movie_index[movie_id] = len(graph.movie_ids)
+                graph.movie_ids.append(movie_id)
+                graph.movie_titles.append(title)
+                graph.movie_years.append(year)
+
+        # Collect edges as two parallel integer arrays
+        edge_people = array("q")
+        edge_movies = array("q")
+        with open(f"{directory}/stars.csv", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for person_id, movie_id in reader:
+                person = graph.person_index.get(person_id)
+                movie = graph.movie_index.get(movie_id)
+                if person is None or movie is None:
+                    continue
+                edge_people.append(person)
+                edge_movies.append(movie)
+
+        graph.build(edge_people, edge_movies)
+        graph.index_names()
+        return graph
+
+    def build(self, edge_people, edge_movies):
+        """
+        Builds both CSR adjacencies from parallel arrays of
+        (person index, movie index) edges, dropping duplicate edges.
+        """
+        self.person_offsets, self.person_movies = _csr(
+            len(self.person_ids), edge_people, edge_movies
+        )
+        self.movie_offsets, self.movie_stars = _csr(
+            len(self.movie_ids), edge_movies, edge_people
+        )
+
+    def index_names(self):
+        """
+        Rebuilds the lowercase name -> person indices lookup.
+        """
+        self.names = {}
+        for person, name in enumerate(self.person_names):
+            self.names.setdefault(name.lower(), []).append(person)
+
+    def movies_of(self, person):
+        """
+        Returns the movie indices of a person index.
+        """
+        offsets = self.person_offsets
+        return self.person_movies[offsets[person]:offsets[person + 1]]
+
+    def stars_of(self, movie):
+        """
+        Returns the person indices starring in a movie index.
+        """
+        offsets = self.movie_offsets
+        return self.movie_stars[offsets[movie]:offsets[movie + 1]]
+
+    def neighbors(self, person):
+        """
+        Yields (movie index, person index) pairs for people
+        who starred with a given person index.
+        """
+        movie_offsets = self.movie_offsets
+        movie_stars = self.movie_stars
+        for movie in self.movies_of(person):
+            for i in range(movie_offsets[movie], movie_offsets[movie + 1]):
+                yield movie, movie_stars[i]
+
+    def search_neighbors(self):
+        """
+        Returns a function giving the (movie index, person index) pairs
+        reachable from a person index, for use by a single search.
+
+        Each movie is expanded once per function: by the time a breadth
+        first search reaches a movie a second time, all its stars have
+        already been reached.
+        """
+        person_offsets = self.person_offsets
+        person_movies = self.person_movies
+        movie_offsets = self.movie_offsets
+        movie_stars = self.movie_stars
+        expanded = bytearray(len(self.movie_ids))
+
+        def neighbors(person):
+            pairs = []
+            for i in range(person_offsets[person], person_offsets[person + 1]):
+                movie = person_movies[i]
+                if expanded[movie]:
+                    continue
+                expanded[movie] = 1
+                stars = movie_stars[movie_offsets[movie]:movie_offsets[movie + 1]]
+                pairs.extend(zip([movie] * len(stars), stars))
+            return pairs
+
+        return neighbors
+
+    def neighbors_for_person(self, person_id):
+        """
+        Returns (movie_id, person_id) pairs for people
+        who starred with a given person.
+        """
+        person_ids = self.person_ids
+        movie_ids = self.movie_ids
+        return {
+            (movie_ids[movie], person_ids[person])
+            for movie, person in self.neighbors(self.person_index[person_id])
+        }
+
+    def person_ids_for_name(self, name):
+        """
+        Returns the IMDB ids of every person with a given name.
+        """
+        return [self.person_ids[person]
+                for person in self.names.get(name.lower(), ())]
+
+    def person(self, person_id):
+        """
+        Returns the name and birth of a person as a dictionary.
+        """
+        person = self.person_index[person_id]
+        return {
+            "name": self.person_names[person],
+            "birth": self.person_births[person]
+        }
+
+    def movie(self, movie_id):
+        """
+        Returns the title and year of a movie as a dictionary.
+        """
+        movie = self.movie_index[movie_id]
+        return {
+            "title": self.movie_titles[movie],
+            "year": self.movie_years[movie]
+        }
+
+
+def _csr(size, rows, columns):
+    """
+    Returns (offsets, indices) arrays grouping `columns` by `rows`,
+    with each row's indices sorted and deduplicated.
+    """
+    # Counting sort of the edges by row
+    offsets = array("q", bytes(8 * (size + 1)))
+    for row in rows:
+        offsets[row + 1] += 1
+    for i in range(size):
+        offsets[i + 1] += offsets[i]
+    cursor = offsets[:-1]
+    indices = array("q", bytes(8 * len(rows)))
+    for row, column in zip(rows, columns):
+        indices[cursor[row]] = column
+        cursor[row] += 1
+
+    # Drop duplicate edges
+    unique_offsets = array("q", [0])
+    unique_indices = array("q")
+    for i in range(size):
+        unique_indices.extend(sorted(set(indices[offsets[i]:offsets[i + 1]])))
+        unique_offsets.append(len(unique_indices))
+    return unique_offsets, unique_indices
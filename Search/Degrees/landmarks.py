@@ -0,0 +1,244 @@
+"""
+Landmark distance index for fast degrees of separation estimates.
+
+Distances from K landmark people to everyone are precomputed by breadth
+first search. By the triangle inequality, for every landmark L:
+
+    |d(L, s) - d(L, t)| <= d(s, t) <= d(L, s) + d(L, t)
+
+so a query is answered from the index alone whenever the best lower and
+upper bounds agree, and otherwise falls back to an exact search.
+
+Usage: python landmarks.py directory [-k K] [--rebuild] [--query SOURCE TARGET]
+"""
+
+import argparse
+import json
+import os
+import struct
+import time
+from array import array
+
+from snapshot import source_stamps
+
+MAGIC = b"DEGLMK\0\0"
+VERSION = 3
+FILENAME = "degrees.landmarks"
+
+# Distances are stored as bytes, with this value meaning "not connected"
+UNREACHABLE = 255
+# and this one "connected, at least this far away"
+FAR = 254
+
+# Magic, version, k, people, movies, edges and the length of the JSON
+# CSV stamps that follow
+_HEADER = struct.Struct("<8sIIqqqI")
+
+
+class LandmarkIndex():
+
+    def __init__(self, graph, landmarks, distances):
+        self.graph = graph
+        # Person indices of the landmarks
+        self.landmarks = landmarks
+        # One array("B") of distances to every person per landmark
+        self.distances = distances
+
+    @classmethod
+    def build(cls, graph, k=16):
+        """
+        Picks the `k` people with the most movies as landmarks
+        and computes their distances to everyone.
+        """
+        people = len(graph.person_ids)
+        offsets = graph.person_offsets
+        by_degree = sorted(range(people),
+                           key=lambda person: offsets[person] - offsets[person + 1])
+        landmarks = by_degree[:k]
+        distances = [bfs_distances(graph, landmark) for landmark in landmarks]
+        return cls(graph, landmarks, distances)
+
+    def bounds(self, source, target):
+        """
+        Returns (lower, upper) bounds on the distance between two person
+        indices. Both are None if the people are known to be disconnected;
+        `upper` is None if it is unknown, e.g. when no landmark reaches
+        either of them, in which case they may still be disconnected.
+        """
+        if source == target:
+            return 0, 0
+        lower = 1
+        upper = None
+        for distances in self.distances:
+            to_source = distances[source]
+            to_target = distances[target]
+            if to_source == UNREACHABLE and to_target == UNREACHABLE:
+                continue
+            if to_source == UNREACHABLE or to_target == UNREACHABLE:
+                # One is in the landmark's component and the other is not
+                return None, None
+            lower = max(lower, abs(to_source - to_target))
+            if to_source == FAR or to_target == FAR:
+                # Only the lower bound holds past the stored range
+                continue
+            if upper is None or to_source + to_target < upper:
+                upper = to_source + to_target
+        return lower, upper
+
+    def distance(self, source_id, target_id, fallback=None):
+        """
+        Returns the degrees of separation between two person ids, or None
+        if they are not connected. When the bounds disagree, `fallback`
+        (a function returning a path, like `degrees.shortest_path`)
+        computes the exact distance; without one, the upper bound is
+        returned, and ValueError is raised if there is none.
+        """
+        lower, upper = self.bounds(self.graph.person_index[source_id],
+                                   self.graph.person_index[target_id])
+        if lower == upper:
+            return upper
+        if fallback is None:
+            if upper is None:
+                raise ValueError("distance not bounded by the landmarks, "
+                                 "a fallback search is needed")
+            return upper
+        path = fallback(source_id, target_id)
+        return None if path is None else len(path)
+
+    def save(self, path, stamps):
+        """
+        Writes the index to `path`, tagged with the CSV `stamps`
+        (see `snapshot.source_stamps`).
+        """
+        graph = self.graph
+        stamps = json.dumps(stamps).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, len(self.landmarks),
+                                 len(graph.person_ids), len(graph.movie_ids),
+                                 len(graph.person_movies), len(stamps)))
+            f.write(stamps)
+            f.write(array("q", self.landmarks).tobytes())
+            for distances in self.distances:
+                f.write(distances.tobytes())
+
+    @classmethod
+    def load(cls, graph, path, stamps):
+        """
+        Reads the index at `path`, or returns None if it is missing
+        or was built for a different graph or different CSV `stamps`.
+        """
+        try:
+            f = open(path, "rb")
+        except OSError:
+            return None
+        with f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return None
+            (magic, version, k, people, movies, edges,
+             stamps_size) = _HEADER.unpack(header)
+            if (magic != MAGIC or version != VERSION
+                    or people != len(graph.person_ids)
+                    or movies != len(graph.movie_ids)
+                    or edges != len(graph.person_movies)
+                    or json.loads(f.read(stamps_size)) != stamps):
+                return None
+            landmarks = array("q")
+            landmarks.frombytes(f.read(8 * k))
+            distances = []
+            for _ in range(k):
+                row = array("B")
+                row.frombytes(f.read(people))
+                distances.append(row)
+        return cls(graph, list(landmarks), distances)
+
+
+def bfs_distances(graph, source):
+    """
+    Returns an array("B") of distances in person hops from the person
+    index `source`, with FAR for everyone FAR or more hops away.
+    """
+    people = len(graph.person_ids)
+    distances = array("B", bytes([UNREACHABLE]) * people)
+    # A movie only needs to be scanned the first time it is reached
+    seen_movies = bytearray(len(graph.movie_ids))
+    person_offsets = graph.person_offsets
+    person_movies = graph.person_movies
+    movie_offsets = graph.movie_offsets
+    movie_stars = graph.movie_stars
+
+    distances[source] = 0
+    frontier = [source]
+    depth = 0
+    while frontier:
+        depth = min(depth + 1, FAR)
+        next_frontier = []
+        for person in frontier:
+            for i in range(person_offsets[person], person_offsets[person + 1]):
+                movie = person_movies[i]
+                if seen_movies[movie]:
+                    continue
+                seen_movies[movie] = 1
+                for j in range(movie_offsets[movie], movie_offsets[movie + 1]):
+                    star = movie_stars[j]
+                    if distances[star] == UNREACHABLE:
+                        distances[star] = depth
+                        next_frontier.append(star)
+        frontier = next_frontier
+    return distances
+
+
+def load_index(graph, directory, k=16, rebuild=False):
+    """
+    Returns the landmark index stored alongside the dataset in `directory`,
+    building and saving it first if needed.
+    """
+    path = os.path.join(directory, FILENAME)
+    stamps = source_stamps(directory)
+    index = None if rebuild else LandmarkIndex.load(graph, path, stamps)
+    if index is None or len(index.landmarks) != k:
+        index = LandmarkIndex.build(graph, k)
+        try:
+            index.save(path, stamps)
+        except OSError:
+            pass
+    return index
+
+
+def main():
+    import batch
+    import degrees
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("directory")
+    parser.add_argument("-k", type=int, default=16, help="number of landmarks")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="rebuild the index even if one is saved")
+    parser.add_argument("--query", nargs=2, metavar=("SOURCE", "TARGET"),
+                        help="names or ids of two people")
+    args = parser.parse_args()
+
+    degrees.load_data(args.directory, "compact")
+    start = time.perf_counter()
+    index = load_index(degrees.graph, args.directory, args.k, args.rebuild)
+    print(f"Index of {len(index.landmarks)} landmarks ready in "
+          f"{time.perf_counter() - start:.3f}s.")
+
+    if args.query:
+        source = batch.resolve(args.query[0])
+        target = batch.resolve(args.query[1])
+        start = time.perf_counter()
+        lower, upper = index.bounds(degrees.graph.person_index[source],
+                                    degrees.graph.person_index[target])
+        elapsed = time.perf_counter() - start
+        print(f"Bounds: {lower}..{'?' if upper is None else upper} "
+              f"({elapsed * 1e6:.1f}us)")
+        distance = index.distance(source, target, degrees.shortest_path)
+        if distance is None:
+            print("Not connected.")
+        else:
+            print(f"{distance} degrees of separation.")
+
+
+if __name__ == "__main__":
+    main()
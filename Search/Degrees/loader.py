@@ -0,0 +1,119 @@
+"""
+Streaming, low-memory loader for the people, movies and stars CSV files.
+
+Rows are parsed in chunks with a plain `csv.reader` instead of building a
+dictionary per row, ids are interned so every reference to a person or
+movie shares one string, and records are `__slots__` objects holding
+tuples rather than per-row dictionaries of sets.
+"""
+
+import csv
+import sys
+from itertools import islice
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+CHUNK_SIZE = 65536
+
+
+class Record():
+    """
+    Base for slotted records that can still be read as `record["field"]`,
+    like the dictionaries built by `degrees.load_csv`.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+
+class Person(Record):
+    __slots__ = ("name", "birth", "movies")
+
+    def __init__(self, name, birth):
+        self.name = name
+        self.birth = birth
+        self.movies = ()
+
+
+class Movie(Record):
+    __slots__ = ("title", "year", "stars")
+
+    def __init__(self, title, year):
+        self.title = title
+        self.year = year
+        self.stars = ()
+
+
+def chunks(path, chunk_size=CHUNK_SIZE):
+    """
+    Yields lists of at most `chunk_size` rows of a CSV file,
+    skipping its header.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        while True:
+            chunk = list(islice(reader, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+
+def load_streaming(directory, names, people, movies, chunk_size=CHUNK_SIZE):
+    """
+    Fills the `names`, `people` and `movies` lookups from the CSV files
+    in `directory`, with `Person` and `Movie` records.
+    """
+    intern = sys.intern
+
+    for chunk in chunks(f"{directory}/people.csv", chunk_size):
+        for person_id, name, birth in chunk:
+            person_id = intern(person_id)
+            people[person_id] = Person(name, intern(birth))
+            key = name.lower()
+            if key in names:
+                names[key].add(person_id)
+            else:
+                names[key] = {person_id}
+
+    for chunk in chunks(f"{directory}/movies.csv", chunk_size):
+        for movie_id, title, year in chunk:
+            movies[intern(movie_id)] = Movie(title, intern(year))
+
+    # Gather edges in lists, then freeze them into deduplicated tuples
+    person_movies = {}
+    movie_stars = {}
+    for chunk in chunks(f"{directory}/stars.csv", chunk_size):
+        for person_id, movie_id in chunk:
+            if person_id not in people or movie_id not in movies:
+                continue
+            person_id = intern(person_id)
+            movie_id = intern(movie_id)
+            person_movies.setdefault(person_id, []).append(movie_id)
+            movie_stars.setdefault(movie_id, []).append(person_id)
+
+    while person_movies:
+        person_id, movie_ids = person_movies.popitem()
+        people[person_id].movies = tuple(dict.fromkeys(movie_ids))
+    while movie_stars:
+        movie_id, person_ids = movie_stars.popitem()
+        movies[movie_id].stars = tuple(dict.fromkeys(person_ids))
+
+
+def peak_rss():
+    """
+    Returns the peak resident set size of this process in bytes,
+    or None where the platform does not report it.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
@@ -0,0 +1,94 @@
+"""
+Load generator for server.py.
+
+Sends random /path queries between people of a dataset from several
+client threads and reports queries per second and client-side latency.
+
+Usage: python loadgen.py directory [--url URL] [--clients N]
+                         [--duration SECONDS] [--bidirectional]
+"""
+
+import argparse
+import csv
+import json
+import random
+import threading
+import time
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+
+def person_ids(directory):
+    """
+    Returns every person id of the dataset in `directory`.
+    """
+    with open(f"{directory}/people.csv", encoding="utf-8") as f:
+        return [row["id"] for row in csv.DictReader(f)]
+
+
+def client(url, ids, bidirectional, deadline, latencies, errors, seed):
+    generator = random.Random(seed)
+    while time.perf_counter() < deadline:
+        query = urlencode({
+            "source": generator.choice(ids),
+            "target": generator.choice(ids),
+            "bidirectional": int(bidirectional),
+        })
+        start = time.perf_counter()
+        try:
+            with urlopen(f"{url}/path?{query}") as response:
+                response.read()
+        except (HTTPError, OSError):
+            errors.append(1)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("directory", help="dataset the server was started on")
+    parser.add_argument("--url", default="http://127.0.0.1:8050")
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--bidirectional", action="store_true")
+    args = parser.parse_args()
+
+    ids = person_ids(args.directory)
+    latencies = []
+    errors = []
+    deadline = time.perf_counter() + args.duration
+    threads = [
+        threading.Thread(target=client, args=(
+            args.url, ids, args.bidirectional, deadline, latencies, errors, i
+        ))
+        for i in range(args.clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p50 = percentile(latencies, 0.5)
+    p99 = percentile(latencies, 0.99)
+    print(json.dumps({
+        "queries": len(latencies),
+        "errors": len(errors),
+        "seconds": elapsed,
+        "qps": len(latencies) / elapsed,
+        "p50_ms": None if p50 is None else p50 * 1000,
+        "p99_ms": None if p99 is None else p99 * 1000,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Long-running degrees query server.
+
+Loads the dataset once and answers queries over HTTP from a thread per
+connection:
+
+    GET /path?source=ID&target=ID[&bidirectional=1]
+    GET /person?name=NAME
+    GET /stats
+
+Responses are JSON. /stats reports request counts and latency
+histograms per endpoint.
+
+Usage: python server.py directory [--host HOST] [--port PORT]
+                        [--compact [--no-cache] | --streaming] [--costars]
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import degrees
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+BUCKETS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000,
+           2500, 5000, 10000]
+
+
+class LatencyHistogram():
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0
+        self.sum = 0.0
+
+    def record(self, milliseconds):
+        bucket = len(BUCKETS)
+        for i, bound in enumerate(BUCKETS):
+            if milliseconds <= bound:
+                bucket = i
+                break
+        with self.lock:
+            self.counts[bucket] += 1
+            self.total += 1
+            self.sum += milliseconds
+
+    def quantile(self, q):
+        """
+        Returns the upper bound of the bucket holding quantile `q`,
+        or None if nothing was recorded.
+        """
+        with self.lock:
+            counts = list(self.counts)
+            total = self.total
+        if not total:
+            return None
+        seen = 0
+        for i, count in enumerate(counts):
+            seen += count
+            if seen >= q * total:
+                return BUCKETS[i] if i < len(BUCKETS) else float("inf")
+
+    def summary(self):
+        with self.lock:
+            counts = list(self.counts)
+            total = self.total
+            mean = self.sum / total if total else None
+        buckets = {f"le_{bound}": count for bound, count in zip(BUCKETS, counts)}
+        buckets["le_inf"] = counts[-1]
+        return {
+            "count": total,
+            "mean_ms": mean,
+            "p50_ms": self.quantile(0.5),
+            "p99_ms": self.quantile(0.99),
+            "buckets": buckets,
+        }
+
+
+histograms = {
+    "/path": LatencyHistogram(),
+    "/person": LatencyHistogram(),
+    "/stats": LatencyHistogram(),
+}
+
+
+def path_query(params):
+    source = params["source"]
+    target = params["target"]
+    for person_id in (source, target):
+        degrees.person_for_id(person_id)
+    bidirectional = params.get("bidirectional", "0") not in ("", "0", "false")
+    path = degrees.shortest_path(source, target, bidirectional)
+    return {
+        "source": source,
+        "target": target,
+        "degrees": None if path is None else len(path),
+        "path": path,
+    }
+
+
+def person_query(params):
+    name = params["name"]
+    if degrees.graph is not None:
+        person_ids = degrees.graph.person_ids_for_name(name)
+    else:
+        person_ids = sorted(degrees.names.get(name.lower(), ()))
+    people = []
+    for person_id in person_ids:
+        person = degrees.person_for_id(person_id)
+        people.append({"id": person_id, "name": person["name"],
+                       "birth": person["birth"]})
+    return {"name": name, "people": people}
+
+
+def stats_query(params):
+    return {endpoint: histogram.summary()
+            for endpoint, histogram in histograms.items()}
+
+
+ROUTES = {
+    "/path": path_query,
+    "/person": person_query,
+    "/stats": stats_query,
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        start = time.perf_counter()
+        url = urlsplit(self.path)
+        route = ROUTES.get(url.path)
+        if route is None:
+            self.reply(404, {"error": f"unknown endpoint {url.path}"})
+            return
+
+        params = {key: values[-1]
+                  for key, values in parse_qs(url.query).items()}
+        try:
+            status, body = 200, route(params)
+        except KeyError as e:
+            status, body = 400, {"error": f"unknown or missing {e}"}
+        self.reply(status, body)
+        histograms[url.path].record((time.perf_counter() - start) * 1000)
+
+    def reply(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Keep the console quiet under load
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("directory")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8050)
+    parser.add_argument("--compact", action="store_true",
+                        help="use the integer-indexed CSR graph backend")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="neither read nor write the binary snapshot")
+    parser.add_argument("--streaming", action="store_true",
+                        help="use the chunked low-memory CSV loader")
+    parser.add_argument("--costars", action="store_true",
+                        help="precompute each person's co-stars at load time")
+    args = parser.parse_args()
+
+    if args.compact:
+        backend = "compact"
+    elif args.streaming:
+        backend = "streaming"
+    else:
+        backend = "dict"
+    print("Loading data...")
+    degrees.load_data(args.directory, backend, cache=not args.no_cache,
+                      costars=args.costars)
+
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    print(f"Serving on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Binary snapshot of a `CompactGraph`, so the CSV files only need to be
+parsed once per dataset.
+
+Layout: an 8-byte magic, then a little header (format version and the
+JSON metadata length), the JSON metadata, and 8-byte aligned sections.
+The CSR arrays are stored as raw int64 and memory-mapped on load; the
+string fields are stored as NUL-separated UTF-8 string tables.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+
+from graph import CompactGraph
+
+MAGIC = b"DEGSNAP\0"
+VERSION = 1
+FILENAME = "degrees.snapshot"
+SOURCES = ["people.csv", "movies.csv", "stars.csv"]
+
+ARRAYS = ["person_offsets", "person_movies", "movie_offsets", "movie_stars"]
+STRINGS = ["person_ids", "person_names", "person_births",
+           "movie_ids", "movie_titles", "movie_years"]
+
+_HEADER = struct.Struct("<8sII")
+
+
+def source_stamps(directory):
+    """
+    Returns the size and modification time of each CSV file,
+    which a snapshot must match to be reused.
+    """
+    stamps = {}
+    for name in SOURCES:
+        stat = os.stat(os.path.join(directory, name))
+        stamps[name] = [stat.st_size, stat.st_mtime_ns]
+    return stamps
+
+
+def save_snapshot(graph, path, stamps):
+    """
+    Writes `graph` to `path`, tagged with the CSV `stamps`.
+    """
+    sections = []
+    for name in ARRAYS:
+        sections.append((name, getattr(graph, name).tobytes()))
+    for name in STRINGS:
+        sections.append((name, "\0".join(getattr(graph, name)).encode("utf-8")))
+
+    # Lay sections out after the metadata, each aligned to 8 bytes
+    layout = {}
+    offset = 0
+    for name, data in sections:
+        layout[name] = [offset, len(data)]
+        offset += _aligned(len(data))
+    metadata = json.dumps({
+        "byteorder": sys.byteorder,
+        "sources": stamps,
+        "people": len(graph.person_ids),
+        "movies": len(graph.movie_ids),
+        "sections": layout,
+    }).encode("utf-8")
+    metadata += b" " * (_aligned(_HEADER.size + len(metadata))
+                        - _HEADER.size - len(metadata))
+
+    # Write to a temporary file first so a crash never leaves half a snapshot
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(metadata)))
+        f.write(metadata)
+        for name, data in sections:
+            f.write(data)
+            f.write(b"\0" * (_aligned(len(data)) - len(data)))
+    os.replace(temporary, path)
+
+
+def load_snapshot(path, stamps):
+    """
+    Returns the `CompactGraph` stored at `path`, or None if there is no
+    snapshot there or it does not match this version or the CSV `stamps`.
+    """
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return None
+    with f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return None
+        magic, version, metadata_size = _HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            return None
+        metadata = json.loads(f.read(metadata_size))
+        if (metadata["sources"] != stamps
+                or metadata["byteorder"] != sys.byteorder):
+            return None
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    start = _HEADER.size + metadata_size
+    view = memoryview(mapping)
+    graph = CompactGraph()
+    for name in ARRAYS:
+        offset, size = metadata["sections"][name]
+        setattr(graph, name,
+                view[start + offset:start + offset + size].cast("q"))
+    for name in STRINGS:
+        offset, size = metadata["sections"][name]
+        count = metadata["people" if name.startswith("person") else "movies"]
+        strings = str(view[start + offset:start + offset + size], "utf-8")
+        setattr(graph, name, strings.split("\0") if count else [])
+
+    graph.person_index = dict(zip(graph.person_ids, range(metadata["people"])))
+    graph.movie_index = dict(zip(graph.movie_ids, range(metadata["movies"])))
+    graph.index_names()
+
+    # Keep the mapping alive for as long as the graph uses it
+    graph.mapping = mapping
+    return graph
+
+
+def load_graph(directory, cache=True):
+    """
+    Returns (graph, cached) for the dataset in `directory`, reading the
+    snapshot when it is up to date and otherwise parsing the CSV files
+    and, if `cache` is set, writing a fresh snapshot for the next run.
+    """
+    path = os.path.join(directory, FILENAME)
+    stamps = source_stamps(directory)
+    if cache:
+        graph = load_snapshot(path, stamps)
+        if graph is not None:
+            return graph, True
+
+    graph = CompactGraph.from_csv(directory)
+    if cache:
+        try:
+            save_snapshot(graph, path, stamps)
+        except OSError:
+            # A read-only dataset directory just means no cache
+            pass
+    return graph, False
+
+
+def _aligned(size):
+    return (size + 7) // 8 * 8
@@ -0,0 +1,330 @@
+"""
+Bitboard representation of the tic-tac-toe board.
+
+A state is a pair of 9-bit integers (x, o) where bit 3 * i + j is set if
+that player holds cell (i, j). The functions mirror those of `tictactoe`
+and take and return the same (i, j) actions; `from_board` and `to_board`
+convert to and from the list-of-lists board.
+"""
+
+import math
+from collections import OrderedDict
+
+X = "X"
+O = "O"
+EMPTY = None
+
+FULL = 0b111111111
+
+# Masks of the rows, columns and diagonals
+WIN_MASKS = tuple(
+    sum(1 << (3 * i + j) for i, j in line) for line in (
+        [[(i, j) for j in range(3)] for i in range(3)]
+        + [[(i, j) for i in range(3)] for j in range(3)]
+        + [[(i, i) for i in range(3)], [(i, 2 - i) for i in range(3)]]
+    )
+)
+
+# Cell indices in search order: center, then corners, then edges
+CELL_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+
+# Number of set bits of every 9-bit mask
+POPCOUNT = tuple(bin(mask).count("1") for mask in range(1 << 9))
+
+# The 8 rotations and reflections of the board, as maps from a cell
+# to where it lands
+SYMMETRIES = (
+    lambda i, j: (i, j),
+    lambda i, j: (j, 2 - i),
+    lambda i, j: (2 - i, 2 - j),
+    lambda i, j: (2 - j, i),
+    lambda i, j: (i, 2 - j),
+    lambda i, j: (j, i),
+    lambda i, j: (2 - i, j),
+    lambda i, j: (2 - j, 2 - i),
+)
+
+
+def _permutation(symmetry):
+    permutation = [0] * 9
+    for i in range(3):
+        for j in range(3):
+            ti, tj = symmetry(i, j)
+            permutation[3 * i + j] = 3 * ti + tj
+    return tuple(permutation)
+
+
+def _mask_table(permutation):
+    table = []
+    for mask in range(1 << 9):
+        moved = 0
+        for cell in range(9):
+            if mask >> cell & 1:
+                moved |= 1 << permutation[cell]
+        table.append(moved)
+    return tuple(table)
+
+
+# Per symmetry: where each cell goes, where each cell comes from,
+# and every 9-bit mask already transformed
+PERMUTATIONS = tuple(_permutation(symmetry) for symmetry in SYMMETRIES)
+INVERSES = tuple(
+    tuple(permutation.index(cell) for cell in range(9))
+    for permutation in PERMUTATIONS
+)
+MASK_TABLES = tuple(_mask_table(permutation) for permutation in PERMUTATIONS)
+
+# Transposition table entry flags: the stored value is exact,
+# a lower bound or an upper bound of the true value
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class TranspositionTable():
+    """
+    Search results keyed by canonical board (see `canonical`),
+    so that boards equal up to a rotation or reflection share one entry.
+    At most `max_size` entries are kept, least recently used first out;
+    None means no bound.
+    """
+
+    def __init__(self, max_size=None):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        if self.max_size is not None and len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def initial_state():
+    """
+    Returns starting state of the board.
+    """
+    return (0, 0)
+
+
+def from_board(board):
+    """
+    Returns the (x, o) state of a list-of-lists board.
+    """
+    x = o = 0
+    for i in range(3):
+        for j in range(3):
+            if board[i][j] == X:
+                x |= 1 << (3 * i + j)
+            elif board[i][j] == O:
+                o |= 1 << (3 * i + j)
+    return (x, o)
+
+
+def to_board(state):
+    """
+    Returns the list-of-lists board of an (x, o) state.
+    """
+    x, o = state
+    board = []
+    for i in range(3):
+        row = []
+        for j in range(3):
+            bit = 1 << (3 * i + j)
+            row.append(X if x & bit else O if o & bit else EMPTY)
+        board.append(row)
+    return board
+
+
+def player(state):
+    """
+    Returns player who has the next turn on a board.
+    """
+    x, o = state
+    return X if POPCOUNT[x] == POPCOUNT[o] else O
+
+
+def actions(state):
+    """
+    Returns set of all possible actions (i, j) available on the board.
+    """
+    taken = state[0] | state[1]
+    return [divmod(cell, 3) for cell in range(9) if not taken >> cell & 1]
+
+
+def result(state, action):
+    """
+    Returns the board that results from making move (i, j) on the board.
+    """
+    i, j = action
+    if not (0 <= i < 3 and 0 <= j < 3):
+        raise ValueError('Not a valid choice')
+    bit = 1 << (3 * i + j)
+    x, o = state
+    if (x | o) & bit:
+        raise ValueError('Not a valid choice')
+    if POPCOUNT[x] == POPCOUNT[o]:
+        return (x | bit, o)
+    return (x, o | bit)
+
+
+def has_line(mask):
+    """
+    Returns True if the cells of `mask` include a complete line.
+    """
+    for line in WIN_MASKS:
+        if mask & line == line:
+            return True
+    return False
+
+
+def winner(state):
+    """
+    Returns the winner of the game, if there is one.
+    """
+    if has_line(state[0]):
+        return X
+    if has_line(state[1]):
+        return O
+    return None
+
+
+def terminal(state):
+    """
+    Returns True if game is over, False otherwise.
+    """
+    x, o = state
+    return (x | o) == FULL or has_line(x) or has_line(o)
+
+
+def utility(state):
+    """
+    Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+    """
+    if has_line(state[0]):
+        return 1
+    if has_line(state[1]):
+        return -1
+    return 0
+
+
+def canonical(state):
+    """
+    Returns (key, symmetry) where `key` is the smallest x | o << 9
+    encoding over the 8 symmetries of the state, and `symmetry` is the
+    index of the symmetry giving it.
+    """
+    x, o = state
+    best_key, best_symmetry = None, 0
+    for symmetry, table in enumerate(MASK_TABLES):
+        key = table[x] | table[o] << 9
+        if best_key is None or key < best_key:
+            best_key, best_symmetry = key, symmetry
+    return best_key, best_symmetry
+
+
+def ordered_cells(state):
+    """
+    Returns the empty cell indices, winning moves first, then moves
+    blocking an opponent's win, then center, corners and edges.
+    """
+    x, o = state
+    taken = x | o
+    mine, theirs = (x, o) if POPCOUNT[x] == POPCOUNT[o] else (o, x)
+    wins, blocks, rest = [], [], []
+    for cell in CELL_ORDER:
+        bit = 1 << cell
+        if taken & bit:
+            continue
+        if has_line(mine | bit):
+            wins.append(cell)
+        elif has_line(theirs | bit):
+            blocks.append(cell)
+        else:
+            rest.append(cell)
+    return wins + blocks + rest
+
+
+def search_value(state, alpha, beta, table, stats=None):
+    """
+    Returns (value, cell) for a state, searching with alpha-beta pruning
+    and storing results in a `TranspositionTable`.
+    """
+    if stats is not None:
+        stats["nodes"] = stats.get("nodes", 0) + 1
+    x, o = state
+    if has_line(x):
+        return 1, None
+    if has_line(o):
+        return -1, None
+    if (x | o) == FULL:
+        return 0, None
+
+    key, symmetry = canonical(state)
+    entry = table.get(key)
+    hint = None
+    if entry is not None:
+        value, flag, cell = entry
+        hint = INVERSES[symmetry][cell]
+        if (flag == EXACT or (flag == LOWER and value >= beta)
+                or (flag == UPPER and value <= alpha)):
+            return value, hint
+
+    # Try the previously best move first
+    cells = ordered_cells(state)
+    if hint in cells:
+        cells.remove(hint)
+        cells.insert(0, hint)
+
+    maximizing = POPCOUNT[x] == POPCOUNT[o]
+    original_alpha, original_beta = alpha, beta
+    best, best_cell = (-math.inf if maximizing else math.inf), None
+    for cell in cells:
+        bit = 1 << cell
+        child = (x | bit, o) if maximizing else (x, o | bit)
+        value, _ = search_value(child, alpha, beta, table, stats)
+        if maximizing and value > best:
+            best, best_cell = value, cell
+            alpha = max(alpha, value)
+        elif not maximizing and value < best:
+            best, best_cell = value, cell
+            beta = min(beta, value)
+        if alpha >= beta:
+            break
+
+    if best <= original_alpha:
+        flag = UPPER
+    elif best >= original_beta:
+        flag = LOWER
+    else:
+        flag = EXACT
+    table.put(key, (best, flag, PERMUTATIONS[symmetry][best_cell]))
+    return best, best_cell
+
+
+def best_move(state, table, stats=None):
+    """
+    Returns the optimal action (i, j) for the current player,
+    or None if the game is over.
+    """
+    if terminal(state):
+        return None
+    _, cell = search_value(state, -math.inf, math.inf, table, stats)
+    return divmod(cell, 3)
@@ -0,0 +1,86 @@
+"""
+Compares the full minimax search, alpha-beta search, alpha-beta
+search over the transposition table (cold, then warm), and the
+precomputed solution table.
+
+Counts the nodes each engine searches (calls to its value function) and
+the wall time it takes to pick a move, from the empty board by default.
+
+Usage: python compare.py [MOVE ...]    e.g. python compare.py 1,1 0,0
+"""
+
+import sys
+import time
+
+import bitboard
+import solution
+import tictactoe as ttt
+
+
+def count_value_calls(engine, board):
+    """
+    Returns (move, nodes searched, seconds) for an engine built on
+    `tictactoe.max_value` and `tictactoe.min_value`, counting one node
+    per call as the other engines' `stats` do.
+    """
+    originals = ttt.max_value, ttt.min_value
+    calls = [0]
+
+    def counting(value):
+        def counted(board):
+            calls[0] += 1
+            return value(board)
+        return counted
+
+    ttt.max_value, ttt.min_value = (counting(value) for value in originals)
+    try:
+        start = time.perf_counter()
+        move = engine(board)
+        elapsed = time.perf_counter() - start
+    finally:
+        ttt.max_value, ttt.min_value = originals
+    return move, calls[0], elapsed
+
+
+def count_nodes(engine, board):
+    """
+    Returns (move, nodes searched, seconds) for an engine taking a
+    `stats` dictionary.
+    """
+    stats = {"nodes": 0}
+    start = time.perf_counter()
+    move = engine(board, stats)
+    return move, stats["nodes"], time.perf_counter() - start
+
+
+def main():
+    board = ttt.initial_state()
+    for move in sys.argv[1:]:
+        i, j = (int(n) for n in move.split(","))
+        board = ttt.result(board, (i, j))
+
+    ttt.TABLE.clear()
+    runs = [
+        ("exhaustive", count_value_calls(ttt.exhaustive_minimax, board)),
+        ("alphabeta", count_nodes(ttt.alphabeta, board)),
+    ]
+    for name in ["tt cold", "tt warm"]:
+        runs.append((name, count_nodes(
+            lambda board, stats: ttt.table_search(board, ttt.TABLE, stats),
+            board
+        )))
+    runs.append(("lookup", count_nodes(
+        lambda board, stats: (solution.lookup(bitboard.from_board(board))
+                              or (None, None))[1],
+        board
+    )))
+
+    print(f"{'engine':<12}{'move':>10}{'nodes':>12}{'seconds':>12}")
+    for name, (move, nodes, elapsed) in runs:
+        print(f"{name:<12}{str(move):>10}{nodes:>12}{elapsed:>12.6f}")
+    print(f"Transposition table: {len(ttt.TABLE)} entries, "
+          f"{ttt.TABLE.hits} hits, {ttt.TABLE.misses} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Generalized m,n,k-game: an m x n board where k in a row wins.
+
+`Game` offers the same functions as the `tictactoe` module, so the runner
+can drive either. Boards too big to solve are searched by `search`, an
+iterative-deepening alpha-beta search under a time budget that scores
+unfinished positions with a pluggable heuristic evaluator.
+"""
+
+import math
+import time
+
+X = "X"
+O = "O"
+EMPTY = None
+
+
+class Game():
+
+    X = X
+    O = O
+    EMPTY = EMPTY
+
+    def __init__(self, m=3, n=3, k=3):
+        if min(m, n, k) < 1:
+            raise ValueError("board size and win length must be positive")
+        if k > max(m, n):
+            raise ValueError("win length longer than the board")
+        self.m = m
+        self.n = n
+        self.k = k
+        self.lines = self.segments()
+        # Score of a won position, less the plies taken to win it. Every
+        # unfinished line scores under 10 ** k in line_heuristic, so the
+        # heuristic stays well below win // 2
+        self.win = 2 * len(self.lines) * 10 ** k
+
+    def segments(self):
+        """
+        Returns every run of k cells in a row, column or diagonal.
+        """
+        lines = []
+        for i in range(self.m):
+            for j in range(self.n):
+                for di, dj in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+                    end_i = i + di * (self.k - 1)
+                    end_j = j + dj * (self.k - 1)
+                    if 0 <= end_i < self.m and 0 <= end_j < self.n:
+                        lines.append(tuple((i + di * step, j + dj * step)
+                                           for step in range(self.k)))
+        return lines
+
+    def initial_state(self):
+        """
+        Returns starting state of the board.
+        """
+        return [[EMPTY] * self.n for _ in range(self.m)]
+
+    def player(self, board):
+        """
+        Returns player who has the next turn on a board.
+        """
+        xs = sum(row.count(X) for row in board)
+        os = sum(row.count(O) for row in board)
+        return X if xs == os else O
+
+    def actions(self, board):
+        """
+        Returns set of all possible actions (i, j) available on the board.
+        """
+        return [(i, j) for i in range(self.m) for j in range(self.n)
+                if board[i][j] == EMPTY]
+
+    def result(self, board, action):
+        """
+        Returns the board that results from making move (i, j) on the board.
+        """
+        i, j = action
+        if not (0 <= i < self.m and 0 <= j < self.n) or board[i][j] != EMPTY:
+            raise ValueError('Not a valid choice')
+        new = [list(row) for row in board]
+        new[i][j] = self.player(board)
+        return new
+
+    def winner(self, board):
+        """
+        Returns the winner of the game, if there is one.
+        """
+        for line in self.lines:
+            i, j = line[0]
+            mark = board[i][j]
+            if mark != EMPTY and all(board[a][b] == mark for a, b in line):
+                return mark
+        return None
+
+    def terminal(self, board):
+        """
+        Returns True if game is over, False otherwise.
+        """
+        return (self.winner(board) is not None
+                or all(cell != EMPTY for row in board for cell in row))
+
+    def utility(self, board):
+        """
+        Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+        """
+        mark = self.winner(board)
+        if mark == X:
+            return 1
+        elif mark == O:
+            return -1
+        return 0
+
+
+def line_heuristic(game, board):
+    """
+    Scores a position from X's point of view by counting, for every line
+    of k cells held by only one player, 10 to the number of its marks.
+    """
+    score = 0
+    for line in game.lines:
+        xs = os = 0
+        for i, j in line:
+            if board[i][j] == X:
+                xs += 1
+            elif board[i][j] == O:
+                os += 1
+        if xs and not os:
+            score += 10 ** xs
+        elif os and not xs:
+            score -= 10 ** os
+    return score
+
+
+class SearchResult():
+
+    def __init__(self, move, value, depth, nodes, seconds):
+        self.move = move
+        self.value = value
+        # Deepest fully completed iteration
+        self.depth = depth
+        self.nodes = nodes
+        self.seconds = seconds
+
+    def nodes_per_second(self):
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+
+class _Timeout(Exception):
+    pass
+
+
+def search(game, board, time_budget=1.0, evaluate=line_heuristic,
+           max_depth=None, should_stop=None):
+    """
+    Returns a SearchResult for the player to move, deepening the
+    alpha-beta search one ply at a time until the game is solved,
+    `max_depth` is reached, `time_budget` seconds have passed, or
+    `should_stop()` returns True. `evaluate(game, board)` scores
+    positions at the depth limit from X's point of view; its scores are
+    clamped strictly inside +/- game.win // 2, the range of won positions.
+    """
+    start = time.perf_counter()
+    deadline = start + time_budget
+    nodes = [0]
+    moves = ordered_actions(game, board)
+    if not moves or game.winner(board) is not None:
+        return SearchResult(None, game.utility(board) * game.win, 0, 0, 0.0)
+
+    maximizing = game.player(board) == X
+    best_move, best_value, depth = moves[0], None, 0
+    limit = len(moves) if max_depth is None else min(max_depth, len(moves))
+    win = game.win
+    bound = win // 2 - 1
+
+    def value(board, depth, ply, alpha, beta):
+        nodes[0] += 1
+        if nodes[0] % 1024 == 0 and (
+            time.perf_counter() > deadline
+            or (should_stop is not None and should_stop())
+        ):
+            raise _Timeout()
+        mark = game.winner(board)
+        if mark is not None:
+            return (win - ply) if mark == X else -(win - ply)
+        actions = game.actions(board)
+        if not actions:
+            return 0
+        if depth == 0:
+            return max(-bound, min(bound, evaluate(game, board)))
+        if game.player(board) == X:
+            v = -math.inf
+            for action in actions:
+                v = max(v, value(game.result(board, action),
+                                 depth - 1, ply + 1, alpha, beta))
+                alpha = max(alpha, v)
+                if alpha >= beta:
+                    break
+        else:
+            v = math.inf
+            for action in actions:
+                v = min(v, value(game.result(board, action),
+                                 depth - 1, ply + 1, alpha, beta))
+                beta = min(beta, v)
+                if alpha >= beta:
+                    break
+        return v
+
+    try:
+        for iteration in range(1, limit + 1):
+            # Search the previous iteration's best move first
+            moves.remove(best_move)
+            moves.insert(0, best_move)
+            alpha, beta = -math.inf, math.inf
+            iteration_move, iteration_value = None, None
+            for action in moves:
+                v = value(game.result(board, action), iteration - 1, 1,
+                          alpha, beta)
+                if iteration_value is None or (
+                    v > iteration_value if maximizing else v < iteration_value
+                ):
+                    iteration_move, iteration_value = action, v
+                if maximizing:
+                    alpha = max(alpha, v)
+                else:
+                    beta = min(beta, v)
+            best_move, best_value, depth = iteration_move, iteration_value, iteration
+            # A forced win or loss will not change with more depth
+            if abs(best_value) > win // 2:
+                break
+    except _Timeout:
+        pass
+
+    return SearchResult(best_move, best_value, depth, nodes[0],
+                        time.perf_counter() - start)
+
+
+def ordered_actions(game, board):
+    """
+    Returns the available actions, closest to the center first.
+    """
+    center_i = (game.m - 1) / 2
+    center_j = (game.n - 1) / 2
+    return sorted(game.actions(board),
+                  key=lambda a: abs(a[0] - center_i) + abs(a[1] - center_j))
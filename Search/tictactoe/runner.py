@@ -2,7 +2,26 @@ import pygame
 import sys
 import time
 
+import mnk
 import tictactoe as ttt
+from worker import MoveWorker
+
+# Board rows, columns and win length, e.g. python runner.py 4 4 4
+if len(sys.argv) not in (1, 4):
+    sys.exit("Usage: python runner.py [rows columns win_length]")
+m, n, k = (int(arg) for arg in sys.argv[1:]) if len(sys.argv) == 4 else (3, 3, 3)
+
+# Seconds the AI may think per move on boards too big to solve
+time_budget = 2.0
+
+# Shortest time an AI move is shown as thinking, so it is not instant
+min_think = 0.5
+
+# The classic board is played perfectly by the tictactoe module
+if (m, n, k) == (3, 3, 3):
+    game = ttt
+else:
+    game = mnk.Game(m, n, k)
 
 pygame.init()
 size = width, height = 600, 400
@@ -15,11 +34,33 @@ screen = pygame.display.set_mode(size)
 
 mediumFont = pygame.font.Font("OpenSans-Regular.ttf", 28)
 largeFont = pygame.font.Font("OpenSans-Regular.ttf", 40)
-moveFont = pygame.font.Font("OpenSans-Regular.ttf", 60)
+smallFont = pygame.font.Font("OpenSans-Regular.ttf", 16)
+
+# Fit the board between the title and the search statistics,
+# which are shown just above the buttons
+board_top, board_bottom = 60, height - 95
+tile_size = min(80, (board_bottom - board_top) // m, (width - 40) // n)
+moveFont = pygame.font.Font("OpenSans-Regular.ttf", tile_size * 3 // 4)
+
+
+
+def compute_move(board, should_stop):
+    """
+    Returns (move, search statistics text) for the AI on the board.
+    Runs on the worker thread.
+    """
+    if game is ttt:
+        return ttt.minimax(board), None
+    search = mnk.search(game, board, time_budget, should_stop=should_stop)
+    stats = (f"depth {search.depth}, {search.nodes} nodes, "
+             f"{search.nodes_per_second():,.0f} nodes/s")
+    return search.move, stats
+
 
 user = None
-board = ttt.initial_state()
-ai_turn = False
+board = game.initial_state()
+ai_stats = None
+worker = MoveWorker()
 
 while True:
 
@@ -59,21 +100,20 @@ while True:
             mouse = pygame.mouse.get_pos()
             if playXButton.collidepoint(mouse):
                 time.sleep(0.2)
-                user = ttt.X
+                user = game.X
             elif playOButton.collidepoint(mouse):
                 time.sleep(0.2)
-                user = ttt.O
+                user = game.O
 
     else:
 
         # Draw game board
-        tile_size = 80
-        tile_origin = (width / 2 - (1.5 * tile_size),
-                       height / 2 - (1.5 * tile_size))
+        tile_origin = (width / 2 - (n / 2 * tile_size),
+                       (board_top + board_bottom) / 2 - (m / 2 * tile_size))
         tiles = []
-        for i in range(3):
+        for i in range(m):
             row = []
-            for j in range(3):
+            for j in range(n):
                 rect = pygame.Rect(
                     tile_origin[0] + j * tile_size,
                     tile_origin[1] + i * tile_size,
@@ -81,7 +121,7 @@ while True:
                 )
                 pygame.draw.rect(screen, white, rect, 3)
 
-                if board[i][j] != ttt.EMPTY:
+                if board[i][j] != game.EMPTY:
                     move = moveFont.render(board[i][j], True, white)
                     moveRect = move.get_rect()
                     moveRect.center = rect.center
@@ -89,12 +129,12 @@ while True:
                 row.append(rect)
             tiles.append(row)
 
-        game_over = ttt.terminal(board)
-        player = ttt.player(board)
+        game_over = game.terminal(board)
+        player = game.player(board)
 
         # Show title
         if game_over:
-            winner = ttt.winner(board)
+            winner = game.winner(board)
             if winner is None:
                 title = f"Game Over: Tie."
             else:
@@ -102,45 +142,58 @@ while True:
         elif user == player:
             title = f"Play as {user}"
         else:
-            title = f"Computer thinking..."
+            title = f"Computer thinking... {worker.elapsed():.1f}s"
         title = largeFont.render(title, True, white)
         titleRect = title.get_rect()
         titleRect.center = ((width / 2), 30)
         screen.blit(title, titleRect)
 
-        # Check for AI move
+        # Show how the last AI search went
+        if ai_stats is not None:
+            stats = smallFont.render(ai_stats, True, white)
+            statsRect = stats.get_rect()
+            statsRect.center = ((width / 2), height - 80)
+            screen.blit(stats, statsRect)
+
+        # Check for AI move, computed in the background
         if user != player and not game_over:
-            if ai_turn:
-                time.sleep(0.5)
-                move = ttt.minimax(board)
-                board = ttt.result(board, move)
-                ai_turn = False
-            else:
-                ai_turn = True
+            if not worker.busy():
+                position = board
+                worker.start(lambda should_stop: compute_move(position, should_stop))
+            elif worker.elapsed() >= min_think:
+                outcome = worker.poll()
+                if outcome is not None:
+                    move, stats = outcome
+                    if stats is not None:
+                        ai_stats = stats
+                    board = game.result(board, move)
 
         # Check for a user move
         click, _, _ = pygame.mouse.get_pressed()
         if click == 1 and user == player and not game_over:
             mouse = pygame.mouse.get_pos()
-            for i in range(3):
-                for j in range(3):
-                    if (board[i][j] == ttt.EMPTY and tiles[i][j].collidepoint(mouse)):
-                        board = ttt.result(board, (i, j))
-
-        if game_over:
-            againButton = pygame.Rect(width / 3, height - 65, width / 3, 50)
-            again = mediumFont.render("Play Again", True, black)
-            againRect = again.get_rect()
-            againRect.center = againButton.center
-            pygame.draw.rect(screen, white, againButton)
-            screen.blit(again, againRect)
-            click, _, _ = pygame.mouse.get_pressed()
-            if click == 1:
-                mouse = pygame.mouse.get_pos()
-                if againButton.collidepoint(mouse):
-                    time.sleep(0.2)
-                    user = None
-                    board = ttt.initial_state()
-                    ai_turn = False
+            for i in range(m):
+                for j in range(n):
+                    if (board[i][j] == game.EMPTY and tiles[i][j].collidepoint(mouse)):
+                        board = game.result(board, (i, j))
+
+        # Play again once the game is over, or reset it at any time,
+        # abandoning the AI's search
+        againButton = pygame.Rect(width / 3, height - 65, width / 3, 50)
+        again = mediumFont.render("Play Again" if game_over else "Reset",
+                                  True, black)
+        againRect = again.get_rect()
+        againRect.center = againButton.center
+        pygame.draw.rect(screen, white, againButton)
+        screen.blit(again, againRect)
+        click, _, _ = pygame.mouse.get_pressed()
+        if click == 1:
+            mouse = pygame.mouse.get_pos()
+            if againButton.collidepoint(mouse):
+                time.sleep(0.2)
+                worker.cancel()
+                user = None
+                board = game.initial_state()
+                ai_stats = None
 
     pygame.display.flip()
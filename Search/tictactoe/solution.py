@@ -0,0 +1,139 @@
+"""
+Precomputed solution table for tic-tac-toe.
+
+Every position reachable from the empty board is solved once and stored
+in a lookup file indexed by the base-3 encoding of the board, which is a
+perfect hash of the 3^9 possible boards: the byte at index
+sum(cell * 3 ** k) holds the best move in its low 4 bits and the value
+plus one in the next 2, or NO_ENTRY for terminal and unreachable boards.
+
+Run `python solution.py` to rebuild solution.bin.
+"""
+
+import os
+import struct
+import zlib
+
+import bitboard
+
+MAGIC = b"TTTSOLN\0"
+VERSION = 1
+PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "solution.bin")
+
+NO_ENTRY = 0xFF
+SIZE = 3 ** 9
+
+_HEADER = struct.Struct("<8sIII")
+
+# Base-3 weight of every 9-bit mask, so that a board's index is
+# BASE3[x] + 2 * BASE3[o]
+BASE3 = tuple(
+    sum(3 ** cell for cell in range(9) if mask >> cell & 1)
+    for mask in range(1 << 9)
+)
+
+# Loaded lookup table, False until the first lookup
+_table = False
+
+
+def fingerprint():
+    """
+    Returns a checksum of the rules and search order the table was built
+    with, so that a table from different rules is detected as stale.
+    """
+    rules = repr((bitboard.WIN_MASKS, bitboard.CELL_ORDER))
+    return zlib.crc32(rules.encode("ascii"))
+
+
+def index(state):
+    """
+    Returns the base-3 index of an (x, o) state.
+    """
+    return BASE3[state[0]] + 2 * BASE3[state[1]]
+
+
+def reachable_states():
+    """
+    Returns every state reachable from the initial state.
+    """
+    seen = {bitboard.initial_state()}
+    stack = [bitboard.initial_state()]
+    while stack:
+        state = stack.pop()
+        if bitboard.terminal(state):
+            continue
+        for action in bitboard.actions(state):
+            child = bitboard.result(state, action)
+            if child not in seen:
+                seen.add(child)
+                stack.append(child)
+    return seen
+
+
+def build():
+    """
+    Solves every reachable position and returns the lookup table bytes.
+    """
+    table = bytearray([NO_ENTRY]) * SIZE
+    transpositions = bitboard.TranspositionTable()
+    for state in reachable_states():
+        if bitboard.terminal(state):
+            continue
+        value, cell = bitboard.search_value(state, -2, 2, transpositions)
+        table[index(state)] = cell | (value + 1) << 4
+    return bytes(table)
+
+
+def save(table, path=PATH):
+    """
+    Writes lookup table bytes to `path`.
+    """
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, fingerprint(), len(table)))
+        f.write(table)
+
+
+def load(path=PATH):
+    """
+    Returns the lookup table bytes at `path`, or None if the file is
+    missing, truncated or was built for other rules.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) != _HEADER.size + SIZE:
+        return None
+    magic, version, checksum, size = _HEADER.unpack_from(data)
+    if (magic != MAGIC or version != VERSION or checksum != fingerprint()
+            or size != SIZE):
+        return None
+    return data[_HEADER.size:]
+
+
+def lookup(state):
+    """
+    Returns (value, action) for a state from the shipped lookup file,
+    or None if the file is unusable or has no entry for the state.
+    """
+    global _table
+    if _table is False:
+        _table = load()
+    if _table is None:
+        return None
+    entry = _table[index(state)]
+    if entry == NO_ENTRY:
+        return None
+    return (entry >> 4) - 1, divmod(entry & 0xF, 3)
+
+
+def main():
+    table = build()
+    save(table)
+    solved = sum(1 for entry in table if entry != NO_ENTRY)
+    print(f"Solved {solved} positions, wrote {PATH}")
+
+
+if __name__ == "__main__":
+    main()
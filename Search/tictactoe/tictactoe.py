@@ -5,10 +5,25 @@ Tic Tac Toe Player
 import math
 import copy
 
+import bitboard
+import solution
+from bitboard import TranspositionTable
+
 X = "X"
 O = "O"
 EMPTY = None
 
+# Rows, columns and diagonals of the board
+LINES = (
+    [[(i, j) for j in range(3)] for i in range(3)]
+    + [[(i, j) for i in range(3)] for j in range(3)]
+    + [[(i, i) for i in range(3)], [(i, 2 - i) for i in range(3)]]
+)
+
+# Move ordering for alpha-beta search: center, then corners, then edges
+MOVE_ORDER = [(1, 1), (0, 0), (0, 2), (2, 0), (2, 2),
+              (0, 1), (1, 0), (1, 2), (2, 1)]
+
 
 def initial_state():
     """
@@ -65,22 +80,9 @@ def winner(board):
     """
     Returns the winner of the game, if there is one.
     """
-    if all(i == board[0][0] for i in board[0]):
-        return board[0][0]
-    elif all(i == board[1][0] for i in board[1]):
-        return board[1][0]    
-    elif all(i == board[2][0] for i in board[2]):
-        return board[2][0]
-    elif (board[0][0] == board[1][0] == board[2][0]):
-        return board[0][0]
-    elif (board[0][1] == board[1][1] == board[2][1]):
-        return board[0][1]
-    elif (board[0][2] == board[1][2] == board[2][2]):
-        return board[0][2]
-    elif (board[0][0] == board[1][1] == board[2][2]):
-        return board[0][0]
-    elif (board[0][2] == board[1][1] == board[2][0]):
-        return board[0][2]
+    for (i1, j1), (i2, j2), (i3, j3) in LINES:
+        if board[i1][j1] != EMPTY and board[i1][j1] == board[i2][j2] == board[i3][j3]:
+            return board[i1][j1]
     return None
 
 
@@ -124,9 +126,10 @@ def min_value(board):
     return v
 
 
-def minimax(board):
+def exhaustive_minimax(board):
     """
-    Returns the optimal action for the current player on the board.
+    Returns the optimal action for the current player on the board,
+    searching the full game tree.
     """
     action = actions(board)
     highestValue = -1
@@ -145,4 +148,113 @@ def minimax(board):
             if smallestValue > max_value(result(board, moveCase)):
                 smallestValue,optimalMove = (max_value(result(board, moveCase)),moveCase)
         return optimalMove
-    
+
+
+def minimax(board):
+    """
+    Returns the optimal action for the current player on the board.
+
+    Reads the move from the precomputed solution table when it is
+    available, and otherwise searches with alpha-beta over the shared
+    transposition table.
+    """
+    state = bitboard.from_board(board)
+    solved = solution.lookup(state)
+    if solved is not None:
+        return solved[1]
+    return bitboard.best_move(state, TABLE)
+
+
+def completes_line(board, action, mark):
+    """
+    Returns True if playing `mark` at `action` would complete a line.
+    """
+    for line in LINES:
+        if action in line and all(
+            cell == action or board[cell[0]][cell[1]] == mark for cell in line
+        ):
+            return True
+    return False
+
+
+def ordered_actions(board):
+    """
+    Returns the available actions, winning moves first, then moves
+    blocking an opponent's win, then center, corners and edges.
+    """
+    mark = player(board)
+    other = O if mark == X else X
+    moves = [action for action in MOVE_ORDER
+             if board[action[0]][action[1]] == EMPTY]
+    wins = [action for action in moves if completes_line(board, action, mark)]
+    blocks = [action for action in moves
+              if action not in wins and completes_line(board, action, other)]
+    rest = [action for action in moves
+            if action not in wins and action not in blocks]
+    return wins + blocks + rest
+
+
+def alphabeta_value(board, alpha, beta, stats=None):
+    """
+    Returns the minimax value of a board, searching with alpha-beta pruning.
+    """
+    if stats is not None:
+        stats["nodes"] = stats.get("nodes", 0) + 1
+    if terminal(board):
+        return utility(board)
+
+    if player(board) == X:
+        v = -math.inf
+        for action in ordered_actions(board):
+            v = max(v, alphabeta_value(result(board, action), alpha, beta, stats))
+            alpha = max(alpha, v)
+            if alpha >= beta:
+                break
+    else:
+        v = math.inf
+        for action in ordered_actions(board):
+            v = min(v, alphabeta_value(result(board, action), alpha, beta, stats))
+            beta = min(beta, v)
+            if alpha >= beta:
+                break
+    return v
+
+
+def alphabeta(board, stats=None):
+    """
+    Returns the optimal action for the current player on the board,
+    using alpha-beta pruning with move ordering.
+
+    If `stats` is a dictionary, its "nodes" entry counts searched boards.
+    """
+    if terminal(board):
+        return None
+
+    maximizing = player(board) == X
+    alpha, beta = -math.inf, math.inf
+    optimalMove = None
+    for action in ordered_actions(board):
+        v = alphabeta_value(result(board, action), alpha, beta, stats)
+        if maximizing and v > alpha:
+            alpha, optimalMove = v, action
+        elif not maximizing and v < beta:
+            beta, optimalMove = v, action
+        # Nothing beats a forced win
+        if (maximizing and alpha == 1) or (not maximizing and beta == -1):
+            break
+    return optimalMove
+
+
+def table_search(board, table, stats=None):
+    """
+    Returns the optimal action for the current player on the board,
+    using alpha-beta search over a transposition table.
+
+    The search runs on the bitboard form of the board, with boards
+    equal up to a rotation or reflection sharing one table entry.
+    """
+    return bitboard.best_move(bitboard.from_board(board), table, stats)
+
+
+# Shared by every call to minimax
+TABLE = TranspositionTable(max_size=100000)
@@ -0,0 +1,176 @@
+"""
+Headless self-play tournament and engine benchmark.
+
+Plays games between two engines using the `tictactoe` module functions
+and reports games per second, nodes searched per second, average move
+latency per side and the outcome distribution.
+
+Usage: python tournament.py [--x ENGINE] [--o ENGINE] [--games N]
+                            [--workers N] [--seed S] [--json]
+
+Engines: minimax, table, alphabeta, iterative, exhaustive, random
+"""
+
+import argparse
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import mnk
+import tictactoe as ttt
+from compare import count_value_calls
+
+# Each process keeps one table across games, like the runner does
+TABLE = ttt.TranspositionTable()
+GAME = mnk.Game(3, 3, 3)
+
+
+def random_engine(board, stats, generator):
+    return generator.choice(ttt.actions(board))
+
+
+def minimax_engine(board, stats, generator):
+    return ttt.minimax(board)
+
+
+def table_engine(board, stats, generator):
+    return ttt.table_search(board, TABLE, stats)
+
+
+def alphabeta_engine(board, stats, generator):
+    return ttt.alphabeta(board, stats)
+
+
+def iterative_engine(board, stats, generator):
+    search = mnk.search(GAME, board, time_budget=1.0)
+    stats["nodes"] = stats.get("nodes", 0) + search.nodes
+    return search.move
+
+
+def exhaustive_engine(board, stats, generator):
+    move, nodes, _ = count_value_calls(ttt.exhaustive_minimax, board)
+    stats["nodes"] = stats.get("nodes", 0) + nodes
+    return move
+
+
+ENGINES = {
+    "minimax": minimax_engine,
+    "table": table_engine,
+    "alphabeta": alphabeta_engine,
+    "iterative": iterative_engine,
+    "exhaustive": exhaustive_engine,
+    "random": random_engine,
+}
+
+
+def play_game(x_engine, o_engine, seed):
+    """
+    Plays one game and returns (winner, {player: [nodes, moves, seconds]}).
+    """
+    generator = random.Random(seed)
+    engines = {ttt.X: ENGINES[x_engine], ttt.O: ENGINES[o_engine]}
+    totals = {ttt.X: [0, 0, 0.0], ttt.O: [0, 0, 0.0]}
+    board = ttt.initial_state()
+    while not ttt.terminal(board):
+        mark = ttt.player(board)
+        stats = {"nodes": 0}
+        start = time.perf_counter()
+        move = engines[mark](board, stats, generator)
+        elapsed = time.perf_counter() - start
+        totals[mark][0] += stats["nodes"]
+        totals[mark][1] += 1
+        totals[mark][2] += elapsed
+        board = ttt.result(board, move)
+    return ttt.winner(board), totals
+
+
+def play_games(x_engine, o_engine, seeds):
+    """
+    Plays one game per seed and returns the summed outcomes and totals.
+    """
+    outcomes = {ttt.X: 0, ttt.O: 0, "tie": 0}
+    totals = {ttt.X: [0, 0, 0.0], ttt.O: [0, 0, 0.0]}
+    for seed in seeds:
+        winner, game_totals = play_game(x_engine, o_engine, seed)
+        outcomes[winner or "tie"] += 1
+        for mark in totals:
+            for i in range(3):
+                totals[mark][i] += game_totals[mark][i]
+    return outcomes, totals
+
+
+def run(x_engine, o_engine, games, workers=1, seed=0):
+    """
+    Plays `games` games, optionally across a process pool,
+    and returns the report dictionary.
+    """
+    seeds = list(range(seed, seed + games))
+    start = time.perf_counter()
+    if workers <= 1:
+        results = [play_games(x_engine, o_engine, seeds)]
+    else:
+        chunks = [seeds[i::workers] for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(play_games, [x_engine] * workers,
+                                    [o_engine] * workers, chunks))
+    elapsed = time.perf_counter() - start
+
+    outcomes = {ttt.X: 0, ttt.O: 0, "tie": 0}
+    totals = {ttt.X: [0, 0, 0.0], ttt.O: [0, 0, 0.0]}
+    for chunk_outcomes, chunk_totals in results:
+        for key in outcomes:
+            outcomes[key] += chunk_outcomes[key]
+        for mark in totals:
+            for i in range(3):
+                totals[mark][i] += chunk_totals[mark][i]
+
+    sides = {}
+    for mark, engine in [(ttt.X, x_engine), (ttt.O, o_engine)]:
+        nodes, moves, seconds = totals[mark]
+        sides[mark] = {
+            "engine": engine,
+            "moves": moves,
+            "nodes": nodes,
+            "nodes_per_second": nodes / seconds if seconds else 0.0,
+            "average_move_ms": seconds / moves * 1000 if moves else 0.0,
+        }
+    return {
+        "games": games,
+        "workers": workers,
+        "seconds": elapsed,
+        "games_per_second": games / elapsed if elapsed else 0.0,
+        "outcomes": outcomes,
+        "sides": sides,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--x", default="minimax", choices=ENGINES)
+    parser.add_argument("--o", default="random", choices=ENGINES)
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true",
+                        help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = run(args.x, args.o, args.games, args.workers, args.seed)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{report['games']} games in {report['seconds']:.2f}s "
+          f"({report['games_per_second']:.1f} games/s)")
+    outcomes = report["outcomes"]
+    print(f"X wins: {outcomes[ttt.X]}, O wins: {outcomes[ttt.O]}, "
+          f"ties: {outcomes['tie']}")
+    for mark, side in report["sides"].items():
+        print(f"{mark} ({side['engine']}): {side['moves']} moves, "
+              f"{side['average_move_ms']:.3f} ms/move, "
+              f"{side['nodes']} nodes, {side['nodes_per_second']:,.0f} nodes/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Background computation of AI moves, so the pygame loop keeps drawing
+and handling events while the AI thinks.
+"""
+
+import threading
+import time
+
+
+class MoveWorker():
+    """
+    Runs one move computation at a time on a daemon thread.
+
+    `start(compute)` calls `compute(should_stop)` in the background, where
+    `should_stop()` turns True once the computation is cancelled; the UI
+    then polls for its return value. Results of cancelled computations
+    are discarded.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Incremented on every start and cancel, so stale threads can
+        # tell their result is no longer wanted
+        self.generation = 0
+        self.running = False
+        self.outcome = None
+        self.started = None
+
+    def start(self, compute):
+        with self.lock:
+            self.generation += 1
+            generation = self.generation
+            self.running = True
+            self.outcome = None
+            self.started = time.perf_counter()
+
+        def should_stop():
+            return self.generation != generation
+
+        def run():
+            outcome = compute(should_stop)
+            with self.lock:
+                if self.generation == generation:
+                    self.outcome = outcome
+                    self.running = False
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def busy(self):
+        """
+        Returns True while a computation is running or its result
+        has not been collected.
+        """
+        with self.lock:
+            return self.running or self.outcome is not None
+
+    def poll(self):
+        """
+        Returns the finished computation's result once, or None.
+        """
+        with self.lock:
+            outcome, self.outcome = self.outcome, None
+            if outcome is not None:
+                self.started = None
+            return outcome
+
+    def cancel(self):
+        """
+        Abandons the current computation, if any.
+        """
+        with self.lock:
+            self.generation += 1
+            self.running = False
+            self.outcome = None
+            self.started = None
+
+    def elapsed(self):
+        """
+        Returns seconds since the current computation started, or 0.
+        """
+        started = self.started
+        return 0.0 if started is None else time.perf_counter() - started